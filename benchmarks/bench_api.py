@@ -0,0 +1,350 @@
+# benchmarks/bench_api.py
+#
+# Offline throughput / latency benchmark of the API. Starts the fake World
+# Bank and OpenAI servers plus the app under uvicorn, then drives each
+# scenario with a fixed number of concurrent clients (closed loop) and reports
+# p50/p95/p99 latency, requests per second, errors and per-stage timings
+# (agent pipeline stages for /ask-economic, queue/run for report jobs).
+#
+# By default every cache is cold: World Bank lookups always go upstream,
+# the LLM cache is off and every report query is unique. --warm keeps them.
+#
+#   python -m benchmarks.bench_api --concurrency 32 --requests 200 --out run.json
+#   python -m benchmarks.bench_api --scenarios ask_economic --baseline run.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+import httpx
+from benchmarks.load_test import _spawn, _wait_ready, _percentiles
+
+COUNTRIES = ["US", "DE", "FR", "GB", "JP", "CN", "IN", "BR"]
+INDICATORS = ["NY.GDP.MKTP.KD.ZG", "FP.CPI.TOTL.ZG", "SL.UEM.TOTL.ZS"]
+
+QUESTIONS = [
+    "How is inflation evolving in Germany?",
+    "What is the GDP growth outlook for France?",
+    "Is unemployment rising in the United Kingdom?",
+    "How are growth and inflation developing in the United States?",
+    "What is the state of the eurozone economy?",
+]
+
+RAG_QUERIES = [
+    "inflation outlook",
+    "monetary policy and interest rates",
+    "labour market and wage growth",
+    "risks to the growth outlook",
+    "energy prices and headline inflation",
+]
+
+
+class RequestFailed(Exception):
+    pass
+
+
+def _check(response: httpx.Response) -> dict:
+    """
+    The JSON body, or RequestFailed for a non-200 or an {"error": ...} payload
+    (routes report upstream failures that way, with status 200).
+    """
+    if response.status_code != 200:
+        raise RequestFailed(f"HTTP {response.status_code}")
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return {}
+    body = response.json()
+    for payload in (body, body.get("data") if isinstance(body, dict) else None):
+        if isinstance(payload, dict) and payload.get("error"):
+            raise RequestFailed(str(payload["error"]))
+    return body
+
+
+def _params(**params) -> dict:
+    # Leave unset options to the server's defaults
+    return {k: v for k, v in params.items() if v is not None}
+
+
+# ---- Scenarios ----
+# Each takes (client, request index, options) and returns {stage: seconds}
+
+async def _macro_basic(client, i, opts):
+    _check(await client.get("/macro/basic", params={
+        "country": COUNTRIES[i % len(COUNTRIES)], "indicator": INDICATORS[i % len(INDICATORS)],
+    }))
+    return {}
+
+
+async def _macro_live(client, i, opts):
+    _check(await client.get("/macro/live_chart", params={
+        "country": COUNTRIES[i % len(COUNTRIES)], "indicator": INDICATORS[i % len(INDICATORS)],
+    }))
+    return {}
+
+
+async def _macro_window(client, i, opts):
+    # 65 years in pages of 50 force the concurrent multi-page fetch on every cache miss
+    _check(await client.get("/macro/live_chart", params={
+        "country": COUNTRIES[i % len(COUNTRIES)], "indicator": INDICATORS[i % len(INDICATORS)],
+        "date": "1960:2024", "per_page": 50,
+    }))
+    return {}
+
+
+async def _macro_batch(client, i, opts):
+    _check(await client.get("/macro/batch", params={
+        "countries": ",".join(COUNTRIES), "indicator": INDICATORS[i % len(INDICATORS)],
+    }))
+    return {}
+
+
+async def _macro_summary(client, i, opts):
+    _check(await client.get("/macro/summary", params={
+        "country": COUNTRIES[i % len(COUNTRIES)], "indicator": INDICATORS[i % len(INDICATORS)],
+    }))
+    return {}
+
+
+async def _ask_economic(client, i, opts):
+    body = _check(await client.get("/ask-economic", params=_params(
+        query=QUESTIONS[i % len(QUESTIONS)], timings=True, fused=opts.fused,
+    )))
+    timings = body["timings"]
+    stages = defaultdict(float)
+    for name, stage in timings["stages"].items():
+        # fetch:<indicator> -> fetch; parallel branches report their slowest one
+        kind = name.split(":", 1)[0]
+        stages[kind] = max(stages[kind], stage["duration"])
+    stages["pipeline_total"] = timings["total"]
+    return dict(stages)
+
+
+async def _rag_search(client, i, opts):
+    _check(await client.get("/rag/search", params=_params(query=RAG_QUERIES[i % len(RAG_QUERIES)], mode=opts.rag_mode)))
+    return {}
+
+
+async def _rag_batch(client, i, opts):
+    queries = [{"query": f"{q} {i}", "n": 3} for q in RAG_QUERIES]
+    _check(await client.post("/rag/search/batch", json=_params(queries=queries, mode=opts.rag_mode)))
+    return {}
+
+
+def _report_query(i, opts, scenario: str) -> str:
+    question = QUESTIONS[i % len(QUESTIONS)]
+    # Unique queries defeat the artifact cache unless --warm
+    return question if opts.warm else f"{question} ({scenario} {opts.run_id}-{i})"
+
+
+async def _report_generate(client, i, opts):
+    response = await client.get("/report/generate", params={"query": _report_query(i, opts, "generate")})
+    _check(response)
+    if response.headers.get("content-type") != "application/pdf":
+        raise RequestFailed("not a PDF")
+    return {}
+
+
+async def _report_jobs(client, i, opts):
+    job = _check(await client.post("/report/jobs", params={"query": _report_query(i, opts, "jobs")}))
+    while job["status"] not in ("done", "failed"):
+        await asyncio.sleep(opts.poll_interval)
+        job = _check(await client.get(f"/report/jobs/{job['id']}"))
+    if job["status"] != "done":
+        raise RequestFailed(job["error"] or "report failed")
+
+    started = time.perf_counter()
+    response = await client.get(f"/report/jobs/{job['id']}/download")
+    if response.headers.get("content-type") != "application/pdf":
+        raise RequestFailed("not a PDF")
+
+    stages = {"download": time.perf_counter() - started}
+    if not job["cached"]:
+        stages["queue"] = job["started"] - job["created"]
+        stages["run"] = job["finished"] - job["started"]
+    return stages
+
+
+SCENARIOS = {
+    "macro_basic": _macro_basic,
+    "macro_live": _macro_live,
+    "macro_window": _macro_window,
+    "macro_batch": _macro_batch,
+    "macro_summary": _macro_summary,
+    "ask_economic": _ask_economic,
+    "rag_search": _rag_search,
+    "rag_batch": _rag_batch,
+    "report_generate": _report_generate,
+    "report_jobs": _report_jobs,
+}
+
+
+# ---- Driver ----
+
+async def run_scenario(client: httpx.AsyncClient, name: str, opts) -> dict:
+    scenario = SCENARIOS[name]
+    latencies, errors = [], []
+    stages = defaultdict(list)
+
+    async def worker(indices):
+        for i in indices:
+            started = time.perf_counter()
+            try:
+                timings = await scenario(client, i, opts)
+            except (RequestFailed, httpx.HTTPError, KeyError, ValueError) as e:
+                errors.append(f"{e.__class__.__name__}: {e}")
+                continue
+            latencies.append(time.perf_counter() - started)
+            for stage, seconds in timings.items():
+                stages[stage].append(seconds)
+
+    # Warm-up requests aren't recorded
+    if opts.warmup:
+        await asyncio.gather(*(scenario(client, -1 - i, opts) for i in range(opts.warmup)), return_exceptions=True)
+
+    # Workers share one iterator: each request index is served exactly once
+    indices = iter(range(opts.requests))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(indices) for _ in range(opts.concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": opts.requests,
+        "concurrency": opts.concurrency,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_seconds": _percentiles(latencies),
+        "stages": {stage: _percentiles(values) for stage, values in sorted(stages.items())},
+    }
+
+
+async def run_all(base_url: str, opts) -> dict:
+    limits = httpx.Limits(max_connections=opts.concurrency + 10, max_keepalive_connections=opts.concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=opts.timeout) as client:
+        results = {}
+        for name in opts.scenarios:
+            results[name] = await run_scenario(client, name, opts)
+            print(f"{name}: {results[name]['requests_per_second']} req/s, "
+                  f"p50 {results[name]['latency_seconds'].get('p50')}s, errors {results[name]['errors']}",
+                  file=sys.stderr)
+        return results
+
+
+def _git_commit() -> str:
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """
+    Per scenario: this run's p50/p95/p99 and throughput relative to the baseline
+    (e.g. 0.8 = 20% lower latency / throughput than before).
+    """
+    ratios = {}
+    for name, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        ratio = {}
+        for p in ("p50", "p95", "p99"):
+            old, new = before["latency_seconds"].get(p), result["latency_seconds"].get(p)
+            if old and new:
+                ratio[f"latency_{p}"] = round(new / old, 3)
+        if before["requests_per_second"]:
+            ratio["requests_per_second"] = round(result["requests_per_second"] / before["requests_per_second"], 3)
+        ratios[name] = ratio
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline API benchmark with fake World Bank and OpenAI servers")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--warmup", type=int, default=0, help="unrecorded requests before each scenario")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="fake model latency (seconds)")
+    parser.add_argument("--wb-delay", type=float, default=0.05, help="fake World Bank latency (seconds)")
+    parser.add_argument("--wb-error-rate", type=float, default=0.0)
+    parser.add_argument("--warm", action="store_true", help="keep World Bank, LLM and report caches")
+    parser.add_argument("--fused", action="store_true", help="use the agent's single-call fused mode")
+    parser.add_argument("--rag-mode", default=None, help="vector or hybrid (default: server setting)")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--app", default="src.backend.server:app", help="ASGI app to serve")
+    parser.add_argument("--api-port", type=int, default=8770)
+    parser.add_argument("--llm-port", type=int, default=9110)
+    parser.add_argument("--wb-port", type=int, default=9210)
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    parser.add_argument("--baseline", help="earlier --out report to compare against")
+    opts = parser.parse_args()
+    opts.scenarios = [s.strip() for s in opts.scenarios.split(",") if s.strip()]
+    unknown = [s for s in opts.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    opts.fused = opts.fused or None
+    opts.run_id = f"{int(time.time())}"
+
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    env = {
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{opts.llm_port}/v1",
+        "WB_API_URL": f"http://127.0.0.1:{opts.wb_port}/v2",
+        # Fresh caches and report directory per run
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "REPORTS_DIR": os.path.join(workdir, "reports"),
+        "LLM_MAX_CONNECTIONS": str(max(opts.concurrency * 4, 200)),
+    }
+    if not opts.warm:
+        # A negative TTL makes every series lookup a miss
+        env.update(LLM_CACHE_ENABLED="false", WB_CACHE_TTL="-1", WB_CACHE_STALE_TTL="0")
+
+    llm = _spawn(["-m", "benchmarks.fake_openai", "--port", str(opts.llm_port), "--delay", str(opts.llm_delay)])
+    wb = _spawn(["-m", "benchmarks.fake_worldbank", "--port", str(opts.wb_port),
+                 "--delay", str(opts.wb_delay), "--error-rate", str(opts.wb_error_rate)])
+    api = _spawn(["-m", "uvicorn", opts.app, "--port", str(opts.api_port), "--log-level", "warning"], env=env)
+
+    base_url = f"http://127.0.0.1:{opts.api_port}"
+    try:
+        asyncio.run(_wait_ready(f"http://127.0.0.1:{opts.llm_port}/docs"))
+        asyncio.run(_wait_ready(f"http://127.0.0.1:{opts.wb_port}/docs"))
+        asyncio.run(_wait_ready(f"{base_url}/health"))
+        scenarios = asyncio.run(run_all(base_url, opts))
+    finally:
+        for proc in (api, wb, llm):
+            proc.terminate()
+        for proc in (api, wb, llm):
+            proc.wait()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "settings": {k: v for k, v in vars(opts).items() if k not in ("out", "baseline", "run_id")},
+        },
+        "scenarios": scenarios,
+    }
+    if opts.baseline:
+        with open(opts.baseline, "r", encoding="utf-8") as f:
+            report["vs_baseline"] = compare(report, json.load(f))
+
+    print(json.dumps(report, indent=2))
+    if opts.out:
+        with open(opts.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
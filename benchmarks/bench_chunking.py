@@ -0,0 +1,117 @@
+# benchmarks/bench_chunking.py
+#
+# Memory and speed of the streaming chunker (pdf_extract.iter_chunks) against
+# the splitter it reproduces (chunk_text on the joined text), on the bundled
+# PDFs and on a synthetic document with a single "\n\n" (one top-level piece
+# as long as the whole document). Chunks must be identical, and the peak
+# memory allocated while streaming must stay within about one page plus
+# CHUNK_SIZE, however long the document.
+#
+#   python -m benchmarks.bench_chunking --pages 400 --out chunking.json
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from src.backend.rags import pdf_extract
+from src.backend.rags.pdf_extract import CHUNK_SIZE, SEPARATORS
+
+WORDS = ["inflation", "growth", "euro", "area", "outlook", "wages", "energy", "prices", "policy", "rates"]
+
+
+def synthetic_pages(count: int, seed: int) -> list:
+    """
+    Newline-terminated pages of about 4,000 characters: sentences and lines,
+    but a paragraph break only at the very start.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for number in range(count):
+        lines = []
+        while sum(map(len, lines)) < 4000:
+            sentences = [" ".join(rng.choices(WORDS, k=rng.randint(4, 14))).capitalize() for _ in range(rng.randint(1, 4))]
+            lines.append(". ".join(sentences) + ".\n")
+        pages.append(("Title\n\n" if number == 0 else "") + "".join(lines))
+    return pages
+
+
+def measure(pages: list) -> dict:
+    text = "".join(pages)
+    separator = next((s for s in SEPARATORS if s in text), SEPARATORS[-1])
+
+    started = time.perf_counter()
+    expected = pdf_extract.chunk_text(text)
+    split_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    identical = list(pdf_extract.iter_chunks(iter(pages), separator)) == expected
+    stream_seconds = time.perf_counter() - started
+
+    # Traced separately, with chunks dropped as they come, as the ingester does
+    tracemalloc.start()
+    for _ in pdf_extract.iter_chunks(iter(pages), separator):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    largest_page = max(len(p) for p in pages)
+    # str stores 1, 2 or 4 bytes per character, set by the widest one
+    widest = max(map(ord, text))
+    width = 4 if widest > 0xFFFF else 2 if widest > 0xFF else 1
+    return {
+        "pages": len(pages),
+        "characters": len(text),
+        "largest_page": largest_page,
+        "chunks": len(expected),
+        "identical": identical,
+        "stream_seconds": round(stream_seconds, 4),
+        "split_seconds": round(split_seconds, 4),
+        "stream_peak_bytes": peak,
+        # Peak held, in units of one page plus one chunk of this text
+        "peak_ratio": round(peak / (width * (largest_page + CHUNK_SIZE)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming chunker benchmark")
+    parser.add_argument("--pdf-dir", default="data/reports_pdfs")
+    parser.add_argument("--pages", type=int, default=400, help="length of the synthetic document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="exit non-zero if the peak exceeds this many times (largest page + CHUNK_SIZE)")
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    documents = {
+        os.path.basename(path): list(pdf_extract.iter_page_texts(path))
+        for path in sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    }
+    documents[f"synthetic_{args.pages}"] = synthetic_pages(args.pages, args.seed)
+    documents[f"synthetic_{args.pages // 10}"] = synthetic_pages(args.pages // 10, args.seed)
+
+    report = {name: measure(pages) for name, pages in documents.items() if pages}
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    for name, result in report.items():
+        if not result["identical"]:
+            print(f"{name}: streamed chunks differ from chunk_text", file=sys.stderr)
+            failed = True
+        if result["peak_ratio"] > args.max_ratio:
+            print(f"{name}: peak of {result['stream_peak_bytes']} bytes is {result['peak_ratio']}x "
+                  f"(largest page + CHUNK_SIZE), over {args.max_ratio}x", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
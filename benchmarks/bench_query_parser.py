@@ -0,0 +1,206 @@
+# benchmarks/bench_query_parser.py
+#
+# Speed and accuracy of country / indicator detection: the compiled
+# single-pass parser against the substring loops it replaced, both as they
+# were (5 countries, 6 keywords) and stretched over the parser's tables.
+# Queries are generated from templates with known answers, mixing names,
+# demonyms, upper-case codes, region names that contain a country alias
+# ("Latin American", which is no country) and filler text full of false
+# friends ("thus", "focus", "design", "made").
+#
+#   python -m benchmarks.bench_query_parser --queries 5000 --out parser.json
+
+import argparse
+import json
+import random
+import statistics
+import time
+from src.backend.tools import query_parser
+
+# Mention → expected country code (None: a region, no country)
+COUNTRY_MENTIONS = [
+    ("Germany", "DE"), ("German", "DE"), ("DEU", "DE"), ("France", "FR"), ("French", "FR"),
+    ("the US", "US"), ("the United States", "US"), ("USA", "US"), ("the UK", "GB"),
+    ("Britain", "GB"), ("the euro area", "EU"), ("the eurozone", "EU"), ("Japan", "JP"),
+    ("Japanese", "JP"), ("China", "CN"), ("Chinese", "CN"), ("India", "IN"), ("Brazil", "BR"),
+    ("Mexico", "MX"), ("Canada", "CA"), ("Italy", "IT"), ("Spain", "ES"), ("South Africa", "ZA"),
+    ("Nigeria", "NG"), ("Kenya", "KE"), ("South Korea", "KR"), ("Vietnam", "VN"),
+    ("Indonesia", "ID"), ("Türkiye", "TR"), ("Turkey", "TR"), ("Côte d'Ivoire", "CI"),
+    ("Argentina", "AR"), ("Chile", "CL"), ("Poland", "PL"), ("Sweden", "SE"), ("Norway", "NO"),
+    ("Australia", "AU"), ("Egypt", "EG"), ("Iran", "IR"), ("Bolivia", "BO"), ("NGA", "NG"),
+    ("Latin America", None), ("Latin American", None), ("South America", None),
+    ("South American", None), ("North American", None), ("Central America", None),
+]
+
+# Mention → expected indicator code
+INDICATOR_MENTIONS = [
+    ("GDP growth", "NY.GDP.MKTP.KD.ZG"), ("growth", "NY.GDP.MKTP.KD.ZG"),
+    ("inflation", "FP.CPI.TOTL.ZG"), ("CPI", "FP.CPI.TOTL.ZG"),
+    ("unemployment", "SL.UEM.TOTL.ZS"), ("the jobless rate", "SL.UEM.TOTL.ZS"),
+    ("youth unemployment", "SL.UEM.1524.ZS"), ("GDP per capita", "NY.GDP.PCAP.CD"),
+    ("public debt", "GC.DOD.TOTL.GD.ZS"), ("the current account", "BN.CAB.XOKA.GD.ZS"),
+    ("exports", "NE.EXP.GNFS.ZS"), ("FDI", "BX.KLT.DINV.WD.GD.ZS"),
+    ("life expectancy", "SP.DYN.LE00.IN"), ("population", "SP.POP.TOTL"),
+    ("interest rates", "FR.INR.LEND"), ("SL.TLF.CACT.ZS", "SL.TLF.CACT.ZS"),
+]
+
+TEMPLATES = [
+    "What is the latest {i1} in {c1}?",
+    "Compare {i1} and {i2} in {c1}",
+    "How has {c1} {i1} evolved since 2010, and what does that mean for business?",
+    "{c1} vs {c2}: {i1} outlook",
+    "Thus far, the focus in {c1} has been on {i1}; how does {c2} compare?",
+    "Give me a report on {i1} for {c1}, made for a policy audience",
+    "Under the current design of fiscal rules, what drives {i1} and {i2} in {c1}?",
+]
+
+# No country and no indicator in any of these
+FILLER = [
+    "thus the focus is on business design",
+    "made under pressure, used by thousands",
+    "describe the main themes of the document",
+    "what does the author discuss in the introduction?",
+]
+
+
+def make_queries(count: int, seed: int) -> list:
+    """
+    (query, expected countries in order, expected indicators in order).
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            queries.append((rng.choice(FILLER), [], []))
+            continue
+        (c1, k1), (c2, k2) = rng.sample(COUNTRY_MENTIONS, 2)
+        (i1, j1), (i2, j2) = rng.sample(INDICATOR_MENTIONS, 2)
+        template = rng.choice(TEMPLATES)
+        countries = [k for k in ([k1, k2] if "{c2}" in template else [k1]) if k]
+        indicators = [j1, j2] if "{i2}" in template else [j1]
+        queries.append((
+            template.format(c1=c1, c2=c2, i1=i1, i2=i2),
+            list(dict.fromkeys(countries)),
+            list(dict.fromkeys(indicators)),
+        ))
+    return queries
+
+
+# ---- The detection this parser replaced (for comparison) ----
+
+LEGACY_COUNTRIES = {
+    "united states": "US", "usa": "US", "us": "US", "america": "US",
+    "germany": "DE", "deutschland": "DE", "de": "DE",
+    "france": "FR", "fr": "FR",
+    "united kingdom": "GB", "uk": "GB", "britain": "GB",
+    "european union": "EU", "eurozone": "EU", "euro area": "EU", "eu": "EU",
+}
+LEGACY_INDICATORS = {
+    "gdp": "NY.GDP.MKTP.KD.ZG", "growth": "NY.GDP.MKTP.KD.ZG",
+    "inflation": "FP.CPI.TOTL.ZG", "cpi": "FP.CPI.TOTL.ZG",
+    "unemployment": "SL.UEM.TOTL.ZS", "jobless": "SL.UEM.TOTL.ZS",
+}
+
+
+def legacy_parse(text: str) -> dict:
+    text = text.lower()
+    country = next((code for name, code in LEGACY_COUNTRIES.items() if name in text), None)
+    indicators = {code for keyword, code in LEGACY_INDICATORS.items() if keyword in text}
+    return {"countries": [country] if country else [], "indicators": sorted(indicators)}
+
+
+def full_table_loop(phrases: dict, codes: dict):
+    """
+    The old substring loop stretched over the parser's full tables (with word
+    boundary checks but no longest-match resolution): what "just add more
+    keys" would have cost.
+    """
+    def parse(text: str) -> dict:
+        lowered = text.lower()
+        found = []
+        for table, haystack in ((phrases, lowered), (codes, text)):
+            for phrase, value in table.items():
+                start = haystack.find(phrase)
+                while start >= 0:
+                    end = start + len(phrase)
+                    if (start == 0 or not haystack[start - 1].isalnum()) and \
+                            (end == len(haystack) or not haystack[end].isalnum()):
+                        found.append((start, value if table is phrases else ("country", value)))
+                    start = haystack.find(phrase, end)
+        found.sort(key=lambda item: item[0])
+        countries = [code for _, (kind, code) in found if kind == "country"]
+        indicators = [code for _, (kind, code) in found if kind == "indicator"]
+        return {"countries": list(dict.fromkeys(countries)), "indicators": list(dict.fromkeys(indicators))}
+    return parse
+
+
+# ---- Measurement ----
+
+def time_parser(parse, queries: list, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for query, _, _ in queries:
+            parse(query)
+        runs.append(time.perf_counter() - started)
+    best = min(runs)
+    return {
+        "median_seconds": round(statistics.median(runs), 4),
+        "us_per_query": round(best / len(queries) * 1e6, 2),
+        "queries_per_second": round(len(queries) / best),
+    }
+
+
+def accuracy(parse, queries: list) -> dict:
+    first_country = indicator_sets = false_positives = 0
+    for query, countries, indicators in queries:
+        found = parse(query)
+        first_country += found["countries"][:1] == countries[:1]
+        indicator_sets += sorted(found["indicators"]) == sorted(indicators)
+        false_positives += not countries and not indicators and bool(found["countries"] or found["indicators"])
+    return {
+        "first_country": round(first_country / len(queries), 4),
+        "indicator_set": round(indicator_sets / len(queries), 4),
+        "filler_false_positives": false_positives,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query parser micro-benchmark")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over the query set")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries, args.seed)
+
+    started = time.perf_counter()
+    query_parser.warm_up()
+    compile_seconds = time.perf_counter() - started
+
+    _, phrases, codes = query_parser._get_matcher()
+    parsers = (
+        ("legacy", legacy_parse),
+        ("legacy_full_tables", full_table_loop(phrases, codes)),
+        ("compiled", query_parser.parse_query),
+    )
+
+    report = {
+        "queries": len(queries),
+        "compile_seconds": round(compile_seconds, 4),
+        "phrases": len(phrases) + len(codes),
+        "parsers": {
+            name: {"timing": time_parser(parse, queries, args.repeat), "accuracy": accuracy(parse, queries)}
+            for name, parse in parsers
+        },
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
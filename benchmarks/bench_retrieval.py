@@ -0,0 +1,173 @@
+# benchmarks/bench_retrieval.py
+#
+# Recall and latency of vector vs hybrid (BM25 + vector) retrieval, with and
+# without MMR re-ranking, over the ingested report collection. Self-supervised:
+# each query is a short phrase cut from a random chunk, and that chunk is the
+# one relevant answer. Also reports the prompt tokens the agent's RAG context
+# costs with and without MMR + adjacent-chunk merging.
+#
+#   python -m benchmarks.bench_retrieval --queries 200 --n 10 --out retrieval.json
+
+import argparse
+import json
+import random
+import time
+import numpy as np
+from src.backend.rags import rag_store
+from src.backend.rags.bm25_index import tokenize
+from src.backend.rags.rerank import merge_adjacent
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except Exception:
+    def count_tokens(text: str) -> int:
+        # Rough English average when tiktoken (or its data files) is unavailable
+        return len(text) // 4
+
+# Natural questions for the context-size comparison
+CONTEXT_QUERIES = [
+    "What is the inflation outlook for the euro area?",
+    "How is GDP growth expected to evolve next year?",
+    "What are the main risks to the economic outlook?",
+    "How are labour markets and unemployment developing?",
+    "What is the stance of monetary policy and interest rates?",
+    "How do tariffs and trade tensions affect growth?",
+    "What happens to wage growth and services inflation?",
+    "How are energy prices affecting headline inflation?",
+    "What is the outlook for fiscal policy and public debt?",
+    "How is consumer spending and household saving evolving?",
+]
+
+
+def make_queries(count: int, words: int, seed: int) -> list:
+    """
+    Pick random chunks and cut a phrase of `words` tokens centred on the
+    chunk's rarest term, so each query has a single well-defined target.
+    """
+    index = rag_store._get_bm25_index()
+    page = rag_store.get_collection().get(include=["documents"])
+    rng = random.Random(seed)
+
+    pairs = list(zip(page["ids"], page["documents"]))
+    rng.shuffle(pairs)
+
+    queries = []
+    for chunk_id, text in pairs:
+        tokens = tokenize(text)
+        if len(tokens) < words:
+            continue
+
+        idf = [index.idf[index.term_index[t]] for t in tokens]
+        centre = int(np.argmax(idf))
+        start = min(max(centre - words // 2, 0), len(tokens) - words)
+        queries.append((" ".join(tokens[start:start + words]), chunk_id))
+
+        if len(queries) == count:
+            break
+
+    return queries
+
+
+def run_mode(mode: str, mmr: bool, queries: list, n: int) -> dict:
+    latencies = []
+    ranks = []
+
+    for query, target in queries:
+        # Measure real lookups, not the memoized result cache
+        rag_store.query_result_cache.clear()
+        rag_store.query_embedding_cache.clear()
+
+        started = time.perf_counter()
+        results = rag_store.search_reports(query, n=n, mode=mode, mmr=mmr)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        ids = results["ids"][0]
+        ranks.append(ids.index(target) + 1 if target in ids else None)
+
+    def recall(k):
+        return round(sum(1 for r in ranks if r and r <= k) / len(ranks), 4)
+
+    return {
+        "recall@1": recall(1),
+        "recall@5": recall(5),
+        f"recall@{n}": recall(n),
+        "mrr": round(sum(1 / r for r in ranks if r) / len(ranks), 4),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 2),
+            "p95": round(float(np.percentile(latencies, 95)), 2),
+            "mean": round(float(np.mean(latencies)), 2),
+        },
+    }
+
+
+def _context(ids: list, documents: list, merge: bool) -> str:
+    passages = merge_adjacent(ids, documents) if merge else documents
+    return "".join(f"- {p}\n" for p in passages)
+
+
+def context_tokens(queries: list, n: int) -> dict:
+    """
+    Mean prompt tokens of the RAG context get_rag_context would build, for
+    plain top-n, MMR top-n, and MMR top-n with adjacent chunks merged.
+    """
+    totals = {"baseline": [], "mmr": [], "mmr_merged": []}
+
+    for query in queries:
+        plain = rag_store.search_reports(query, n=n, mmr=False)
+        diverse = rag_store.search_reports(query, n=n, mmr=True)
+
+        totals["baseline"].append(count_tokens(_context(plain["ids"][0], plain["documents"][0], False)))
+        totals["mmr"].append(count_tokens(_context(diverse["ids"][0], diverse["documents"][0], False)))
+        totals["mmr_merged"].append(count_tokens(_context(diverse["ids"][0], diverse["documents"][0], True)))
+
+    report = {name: round(float(np.mean(values)), 1) for name, values in totals.items()}
+    report["tokens_saved_per_query"] = round(report["baseline"] - report["mmr_merged"], 1)
+    report["tokens_saved_pct"] = (
+        round(100 * report["tokens_saved_per_query"] / report["baseline"], 1) if report["baseline"] else 0.0
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector vs hybrid retrieval benchmark")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--words", type=int, default=6, help="tokens per query phrase")
+    parser.add_argument("--n", type=int, default=10, help="results per query")
+    parser.add_argument("--context-n", type=int, default=3, help="passages per agent context")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries, args.words, args.seed)
+    if not queries:
+        raise SystemExit("Collection is empty: run /rag/ingest first.")
+
+    # Warm up model sessions and the BM25 index outside the timed runs
+    rag_store.search_reports(queries[0][0], n=args.n, mode="hybrid")
+
+    report = {
+        "queries": len(queries),
+        "words_per_query": args.words,
+        "n": args.n,
+        "modes": {
+            f"{mode}+mmr" if mmr else mode: run_mode(mode, mmr, queries, args.n)
+            for mode in rag_store.SEARCH_MODES
+            for mmr in (False, True)
+        },
+        "context_tokens": context_tokens(
+            CONTEXT_QUERIES + [query for query, _ in queries[:40]], args.context_n
+        ),
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/fake_openai.py
+#
+# Minimal OpenAI-compatible chat completions server for offline load tests.
+# Every completion takes --delay seconds (non-blocking), streamed or not.
+#
+#   python -m benchmarks.fake_openai --port 9100 --delay 1.0
+#   OPENAI_BASE_URL=http://127.0.0.1:9100/v1 uvicorn src.backend.server:app
+
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI()
+app.state.delay = 1.0
+
+ANSWER = (
+    "Growth is moderating while inflation eases towards target. "
+    "Labour markets remain tight and risks are tilted to the downside."
+)
+
+
+def _content(body: dict) -> str:
+    """
+    Plain text, or the JSON object the agent's fused mode asks for.
+    """
+    if (body.get("response_format") or {}).get("type") != "json_object":
+        return ANSWER
+
+    prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+    indicators = dict.fromkeys(re.findall(r"Indicator ([A-Z0-9.]+):", prompt))
+    return json.dumps({"summaries": {i: ANSWER for i in indicators}, "analysis": ANSWER})
+
+
+def _usage(content: str) -> dict:
+    tokens = max(len(content) // 4, 1)
+    return {"prompt_tokens": 100, "completion_tokens": tokens, "total_tokens": 100 + tokens}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    content = _content(body)
+    base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "created": int(time.time()), "model": body.get("model", "fake")}
+
+    if not body.get("stream"):
+        await asyncio.sleep(app.state.delay)
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": _usage(content),
+        }
+
+    words = content.split(" ")
+
+    async def events():
+        for i, word in enumerate(words):
+            await asyncio.sleep(app.state.delay / len(words))
+            delta = {"content": word if i == 0 else " " + word}
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        done = {**base, "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        yield f"data: {json.dumps(done)}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = {**base, "object": "chat.completion.chunk", "choices": [], "usage": _usage(content)}
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds per completion")
+    args = parser.parse_args()
+
+    app.state.delay = args.delay
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/fake_worldbank.py
+#
+# Offline stand-in for the World Bank v2 indicator API. Serves canned,
+# deterministic series for any (country, indicator) with the same JSON shape,
+# paging and filters (per_page, page, date, mrv, mrnev) as the real API.
+#
+#   python -m benchmarks.fake_worldbank --port 9200 --delay 0.05
+#   WB_API_URL=http://127.0.0.1:9200/v2 uvicorn src.backend.server:app
+
+import argparse
+import asyncio
+import math
+import random
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI()
+app.state.delay = 0.0
+app.state.error_rate = 0.0
+
+FIRST_YEAR = 1960
+LAST_YEAR = 2024
+
+# Economies returned for country "all"
+ALL_COUNTRIES = {
+    "US": ("USA", "United States"), "DE": ("DEU", "Germany"), "FR": ("FRA", "France"),
+    "GB": ("GBR", "United Kingdom"), "IT": ("ITA", "Italy"), "ES": ("ESP", "Spain"),
+    "NL": ("NLD", "Netherlands"), "JP": ("JPN", "Japan"), "CN": ("CHN", "China"),
+    "IN": ("IND", "India"), "BR": ("BRA", "Brazil"), "CA": ("CAN", "Canada"),
+    "AU": ("AUS", "Australia"), "KR": ("KOR", "Korea, Rep."), "MX": ("MEX", "Mexico"),
+    "ZA": ("ZAF", "South Africa"), "TR": ("TUR", "Turkiye"), "SE": ("SWE", "Sweden"),
+    "CH": ("CHE", "Switzerland"), "PL": ("POL", "Poland"), "EU": ("EUU", "European Union"),
+}
+
+
+def _series(country: str, indicator: str) -> list:
+    """
+    (year, value) pairs, newest first. The same inputs always give the same
+    numbers; the latest year is missing, as it often is upstream.
+    """
+    rng = random.Random(f"{country}|{indicator}")
+    level = rng.uniform(-1.0, 6.0)
+    amplitude = rng.uniform(0.5, 3.0)
+    rows = []
+    for year in range(LAST_YEAR, FIRST_YEAR - 1, -1):
+        if year == LAST_YEAR or rng.random() < 0.05:
+            rows.append((year, None))
+            continue
+        value = level + amplitude * math.sin(year / 3.0) + rng.gauss(0, 0.5)
+        rows.append((year, round(value, 6)))
+    return rows
+
+
+def _year_filter(date: str):
+    if not date:
+        return lambda year: True
+    if ":" in date:
+        start, end = (int(part) for part in date.split(":", 1))
+        return lambda year: start <= year <= end
+    return lambda year: year == int(date)
+
+
+def _record(country: str, indicator: str, year: int, value) -> dict:
+    iso3, name = ALL_COUNTRIES.get(country, (country, country))
+    return {
+        "indicator": {"id": indicator, "value": indicator},
+        "country": {"id": country, "value": name},
+        "countryiso3code": iso3,
+        "date": str(year),
+        "value": value,
+        "unit": "",
+        "obs_status": "",
+        "decimal": 1,
+    }
+
+
+@app.get("/v2/country/{countries}/indicator/{indicator}")
+async def indicator_series(countries: str, indicator: str, request: Request):
+    await asyncio.sleep(app.state.delay)
+    if app.state.error_rate and random.random() < app.state.error_rate:
+        return JSONResponse({"error": "Service unavailable"}, status_code=503)
+
+    params = request.query_params
+    per_page = int(params.get("per_page", 50))
+    page = int(params.get("page", 1))
+    mrv = int(params["mrv"]) if "mrv" in params else None
+    mrnev = int(params["mrnev"]) if "mrnev" in params else None
+    in_range = _year_filter(params.get("date"))
+
+    codes = list(ALL_COUNTRIES) if countries.lower() == "all" else [c.upper() for c in countries.split(";")]
+
+    records = []
+    for code in codes:
+        rows = [(year, value) for year, value in _series(code, indicator) if in_range(year)]
+        if mrnev is not None:
+            rows = [row for row in rows if row[1] is not None][:mrnev]
+        elif mrv is not None:
+            rows = rows[:mrv]
+        records.extend(_record(code, indicator, year, value) for year, value in rows)
+
+    total = len(records)
+    pages = max(math.ceil(total / per_page), 1)
+    start = (page - 1) * per_page
+    meta = {"page": page, "pages": pages, "per_page": per_page, "total": total,
+            "sourceid": "2", "lastupdated": f"{LAST_YEAR + 1}-01-01"}
+    return [meta, records[start:start + per_page] or None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake World Bank indicator API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    args = parser.parse_args()
+
+    app.state.delay = args.delay
+    app.state.error_rate = args.error_rate
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/load_test.py
+#
+# Burst of concurrent LLM-bound requests against the API, with a fake OpenAI
+# server that answers every completion after a fixed delay. If model calls
+# held a worker thread each, concurrency would plateau at the thread pool size
+# (~40) and /health would queue behind them; with the async stack the whole
+# burst overlaps and /health stays fast.
+#
+#   python -m benchmarks.load_test --requests 400 --delay 1.0
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import httpx
+import numpy as np
+
+# Default size of the AnyIO thread pool FastAPI runs sync handlers in
+THREAD_POOL_SIZE = 40
+
+
+def _spawn(args: list, env: dict = None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout:.0f}s")
+
+
+def _percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    return {
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p95": round(float(np.percentile(values, 95)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "max": round(float(np.max(values)), 4),
+    }
+
+
+async def run_burst(base_url: str, path: str, params: dict, requests: int, probe_interval: float) -> dict:
+    limits = httpx.Limits(max_connections=requests + 10, max_keepalive_connections=requests + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        latencies, errors = [], 0
+        health = []
+        running = True
+
+        async def one(i: int):
+            nonlocal errors
+            started = time.perf_counter()
+            response = await client.get(path, params={**params, "query": f"{params.get('query', 'q')} #{i}"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+        async def probe():
+            while running:
+                started = time.perf_counter()
+                await client.get("/health")
+                health.append(time.perf_counter() - started)
+                await asyncio.sleep(probe_interval)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        wall = time.perf_counter() - started
+        running = False
+        await prober
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(requests / wall, 2),
+        # Average number of requests in flight over the burst
+        "effective_concurrency": round(sum(latencies) / wall, 1),
+        "errors": errors,
+        "latency_seconds": _percentiles(latencies),
+        "health_latency_seconds": _percentiles(health),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent LLM route load test")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--delay", type=float, default=1.0, help="fake model latency (seconds)")
+    parser.add_argument("--path", default="/ask-basic")
+    parser.add_argument("--query", default="How is inflation evolving?")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    llm = _spawn(["-m", "benchmarks.fake_openai", "--port", str(args.llm_port), "--delay", str(args.delay)])
+    api = _spawn(
+        ["-m", "uvicorn", "src.backend.server:app", "--port", str(args.api_port), "--log-level", "warning"],
+        env={
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "fake"),
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+            # Every request must reach the (fake) model, none may wait for a connection
+            "LLM_CACHE_ENABLED": "false",
+            "LLM_MAX_CONNECTIONS": str(args.requests),
+        },
+    )
+
+    base_url = f"http://127.0.0.1:{args.api_port}"
+    try:
+        asyncio.run(_wait_ready(f"http://127.0.0.1:{args.llm_port}/docs"))
+        asyncio.run(_wait_ready(f"{base_url}/health"))
+        result = asyncio.run(run_burst(base_url, args.path, {"query": args.query}, args.requests, args.probe_interval))
+    finally:
+        api.terminate()
+        llm.terminate()
+        api.wait()
+        llm.wait()
+
+    report = {"path": args.path, "requests": args.requests, "model_delay_seconds": args.delay, **result}
+    report["ideal_wall_seconds"] = args.delay
+    # What the same burst costs when each model call holds one of ~40 threads
+    report["thread_bound_wall_seconds"] = math.ceil(args.requests / THREAD_POOL_SIZE) * args.delay
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/startup_time.py
+#
+# Boot latency of the API, measured in fresh interpreters so nothing is warm:
+#   - import: `import src.backend.server` (median of --runs)
+#   - ready: launching uvicorn until /health answers
+#   - first_use: building each lazy singleton (LLM client, vector store, ...)
+# plus the slowest imports reported by `python -X importtime`.
+#
+#   python -m benchmarks.startup_time --runs 5 --budget 1.5
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+# Runs in the child interpreter; prints one JSON line of timings
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.backend.server as server
+import_seconds = time.perf_counter() - started
+heavy = [m for m in {heavy!r} if m in sys.modules]
+first_use = {{}}
+if {first_use!r}:
+    for name, load in server.WARMUP_STEPS.items():
+        step = time.perf_counter()
+        try:
+            load()
+            first_use[name] = round(time.perf_counter() - step, 4)
+        except Exception as e:
+            first_use[name] = f"failed: {{e.__class__.__name__}}"
+print(json.dumps({{"import_seconds": import_seconds, "heavy_loaded": heavy, "first_use": first_use}}))
+"""
+
+# Modules that should not be loaded just by importing the app
+HEAVY_MODULES = ("chromadb", "openai", "pandas", "reportlab", "pypdf", "langchain_text_splitters", "onnxruntime")
+
+
+def _env() -> dict:
+    # A placeholder key: importing and booting must not need a real one
+    return {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "startup-bench"), "STARTUP_WARMUP": "false"}
+
+
+def measure_import(first_use: bool = False) -> dict:
+    code = IMPORT_PROBE.format(heavy=HEAVY_MODULES, first_use=first_use)
+    out = subprocess.run([sys.executable, "-c", code], env=_env(), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list:
+    """
+    (module, cumulative seconds) for the top-level imports under src.backend.server.
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.backend.server"],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        # Depth 1-2: the server's own imports and what they pull in directly
+        if match and len(match.group(2)) <= 3:
+            rows.append((match.group(3).strip(), int(match.group(1)) / 1e6))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return [{"module": m, "seconds": round(s, 4)} for m, s in rows[:top]]
+
+
+def measure_ready(port: int, timeout: float = 60.0) -> float:
+    """
+    Seconds from spawning uvicorn until GET /health succeeds.
+    """
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.backend.server:app", "--port", str(port), "--log-level", "warning"],
+        env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                time.sleep(0.02)
+        raise SystemExit(f"server did not answer /health within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--first-use", action="store_true", help="also time building each lazy singleton")
+    parser.add_argument("--budget", type=float, help="exit non-zero if median import time exceeds this (seconds)")
+    parser.add_argument("--out", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    ready = [measure_ready(args.port) for _ in range(args.runs)]
+    import_seconds = [r["import_seconds"] for r in imports]
+
+    report = {
+        "runs": args.runs,
+        "import_seconds": {"median": round(statistics.median(import_seconds), 4), "max": round(max(import_seconds), 4)},
+        "ready_seconds": {"median": round(statistics.median(ready), 4), "max": round(max(ready), 4)},
+        "heavy_loaded_at_import": imports[0]["heavy_loaded"],
+        "slowest_imports": slowest_imports(args.top),
+    }
+    if args.first_use:
+        report["first_use_seconds"] = measure_import(first_use=True)["first_use"]
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget is not None and report["import_seconds"]["median"] > args.budget:
+        print(f"import time {report['import_seconds']['median']:.3f}s exceeds budget {args.budget:.3f}s", file=sys.stderr)
+        sys.exit(1)
+    if report["heavy_loaded_at_import"]:
+        print(f"heavy modules loaded at import: {report['heavy_loaded_at_import']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
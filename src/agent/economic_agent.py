@@ -1,48 +1,32 @@
 # src/agent/economic_agent.py
 
-from openai import OpenAI
-from src.backend.config import OPENAI_API_KEY, MODEL
-from src.backend.tools.macro_fetcher import get_indicator
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from src.backend.config import MODEL, AGENT_FUSED_MODE, RAG_MERGE_ADJACENT
+from src.backend.tools.macro_fetcher import aget_indicator, series_tag
+from src.backend.tools.llm_cache import cached_completion
+from src.backend.tools.llm_client import get_client, chat_completion
+from src.backend.tools import metrics
 from src.backend.tools.country_map import detect_country
-from src.backend.rags.rag_store import search_reports
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-# Keyword → indicator mapping
-INDICATOR_MAP = {
-    "gdp": "NY.GDP.MKTP.KD.ZG",
-    "growth": "NY.GDP.MKTP.KD.ZG",
-
-    "inflation": "FP.CPI.TOTL.ZG",
-    "cpi": "FP.CPI.TOTL.ZG",
-
-    "unemployment": "SL.UEM.TOTL.ZS",
-    "jobless": "SL.UEM.TOTL.ZS",
-}
+from src.backend.tools.indicator_map import DEFAULT_INDICATORS
+from src.backend.tools.query_parser import find_indicators
+from src.backend.rags.rag_store import search_reports, build_where
+from src.backend.rags.rerank import merge_adjacent
 
 
 def detect_indicators(query: str):
     """
-    Scan text for indicator keywords.
+    Indicators named in the query, in order of mention.
     """
-    query = query.lower()
-    indicators = set()
-
-    for keyword, code in INDICATOR_MAP.items():
-        if keyword in query:
-            indicators.add(code)
+    indicators = find_indicators(query)
 
     # Default: if nothing found, return GDP + inflation
-    if not indicators:
-        return [
-            "NY.GDP.MKTP.KD.ZG",     # GDP growth
-            "FP.CPI.TOTL.ZG"         # Inflation
-        ]
-
-    return list(indicators)
+    return indicators or list(DEFAULT_INDICATORS)
 
 
-def summarize_indicator(country: str, indicator: str, data: list):
+async def summarize_indicator(country: str, indicator: str, data: list):
     """
     Given recent macro data, produce a short 2–3 sentence summary.
     """
@@ -62,76 +46,116 @@ Data:
 Summary:
 """
 
-    response = client.chat.completions.create(
+    # Same series → same prompt, so repeat requests are served from the cache
+    return await cached_completion(
+        get_client(),
         model=MODEL,
         messages=[{"role": "user", "content": prompt}],
+        tag=series_tag(country, indicator),
     )
 
-    return response.choices[0].message.content
 
-
-def get_rag_context(query: str, n=3):
+def get_rag_context(query: str, n=3, country: str = None):
     """
     Retrieve the most relevant economic report passages based on the query.
+    With a country, passages about that country come first; only when there
+    are fewer than n of them are the missing slots filled from the rest of
+    the corpus. Neighbouring chunks of the same report are merged into one
+    passage (RAG_MERGE_ADJACENT).
     """
-    results = search_reports(query, n=n)
-
-    rag_context = ""
+    results = search_reports(query, n=n, where=build_where(country=country))
 
     # Chroma returns: {"ids": [[...]], "documents": [[...]], ...}
-    if "documents" in results and results["documents"]:
-        docs = results["documents"][0]
-        for doc in docs:
-            rag_context += f"- {doc}\n"
-    else:
-        rag_context = "No relevant report excerpts found."
+    ids = list(results["ids"][0]) if results.get("ids") else []
+    docs = list(results["documents"][0]) if results.get("documents") else []
+
+    if country and len(ids) < n:
+        # $ne also matches chunks with no country detected
+        rest = search_reports(query, n=n - len(ids), where={"country": {"$ne": country.upper()}})
+        ids += rest["ids"][0] if rest.get("ids") else []
+        docs += rest["documents"][0] if rest.get("documents") else []
+
+    if not docs:
+        return "No relevant report excerpts found."
+
+    passages = merge_adjacent(ids, docs) if RAG_MERGE_ADJACENT else docs
+
+    rag_context = ""
+    for passage in passages:
+        rag_context += f"- {passage}\n"
 
     return rag_context
 
 
-def analyze_economy(query: str, country: str = None):
+@contextmanager
+def _stage(stages: dict, name: str, branch: str, t0: float):
     """
-    Main economic reasoning pipeline:
-    - Detect country
-    - Detect relevant indicators
-    - Fetch macro data
-    - Summarize each indicator with the LLM
-    - Retrieve RAG evidence from reports
-    - Produce a final combined economic analysis
+    Record start/end offsets (seconds since pipeline start) for one stage.
     """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        stages[name] = {
+            "branch": branch,
+            "start": round(start - t0, 4),
+            "end": round(end - t0, 4),
+            "duration": round(end - start, 4),
+        }
+        # Histograms by stage kind: fetch:FP.CPI.TOTL.ZG -> fetch
+        metrics.STAGE_LATENCY.observe(end - start, name.split(":", 1)[0])
+
+
+def _critical_path(stages: dict) -> list:
+    """
+    The branch that finished last before synthesis, followed by the synthesis stages.
+    """
+    branches = {}
+    for name, stage in stages.items():
+        branches.setdefault(stage["branch"], []).append(name)
 
-    # ---- COUNTRY DETECTION ----
-    detected_country = detect_country(query, default=country or "US")
-    country = detected_country.upper()
+    final = branches.pop("synthesis", [])
+    path = []
+    if branches:
+        path = max(branches.values(), key=lambda names: max(stages[n]["end"] for n in names))
 
-    # ---- INDICATOR DETECTION ----
-    indicator_list = detect_indicators(query)
+    return sorted(path, key=lambda n: stages[n]["start"]) + sorted(final, key=lambda n: stages[n]["start"])
 
-    # ---- MACRO DATA + SUMMARIES ----
-    collected_data = []
-    summaries = []
 
-    for indicator in indicator_list:
-        data = get_indicator(country, indicator)
+async def _indicator_branch(country: str, indicator: str, stages: dict, t0: float, summarize: bool = True):
+    """
+    Fetch one indicator and (optionally) summarize it.
+    Returns (summary line or None, raw data or None).
+    """
+    branch = f"indicator:{indicator}"
 
-        if isinstance(data, dict) and "error" in data:
-            summaries.append(f"Error fetching {indicator}: {data['error']}")
-            continue
+    with _stage(stages, f"fetch:{indicator}", branch, t0):
+        data = await aget_indicator(country, indicator)
 
-        # Summarize with LLM
-        summary = summarize_indicator(country, indicator, data)
-        summaries.append(f"Indicator {indicator}:\n{summary}")
+    if isinstance(data, dict) and "error" in data:
+        return f"Error fetching {indicator}: {data['error']}", None
 
-        collected_data.append({
-            "indicator": indicator,
-            "values": data[:5]
-        })
+    recent = data[:5].to_records()
+    raw = {"indicator": indicator, "values": recent}
+    if not summarize:
+        return None, raw
 
-    # ---- RAG CONTEXT ----
-    rag_context = get_rag_context(query, n=3)
+    # Summarize with LLM
+    with _stage(stages, f"summarize:{indicator}", branch, t0):
+        summary = await summarize_indicator(country, indicator, recent)
 
-    # ---- FINAL SYNTHESIS ----
-    final_prompt = f"""
+    return f"Indicator {indicator}:\n{summary}", raw
+
+
+async def _rag_branch(query: str, stages: dict, t0: float, country: str = None):
+    # Chroma and the embedding model are blocking: keep them off the event loop
+    with _stage(stages, "rag", "rag", t0):
+        return await asyncio.to_thread(get_rag_context, query, 3, country)
+
+
+def _synthesis_prompt(query: str, country: str, indicator_list: list, summaries: list, rag_context: str) -> str:
+    return f"""
 User question:
 "{query}"
 
@@ -155,14 +179,158 @@ Your answer should:
 - sound like a professional economic analyst.
 """
 
-    final_response = client.chat.completions.create(
+
+def _fused_prompt(query: str, country: str, collected_data: list, errors: list, rag_context: str) -> str:
+    tables = []
+    for item in collected_data:
+        rows = [f"{row['date']}: {row['value']}" for row in item["values"]]
+        tables.append(f"Indicator {item['indicator']}:\n" + "\n".join(rows))
+
+    return f"""
+You are an economic analyst.
+
+User question:
+"{query}"
+
+Country detected: {country}
+
+=== MACRO DATA ===
+{chr(10).join(tables + errors)}
+
+=== EXCERPTS FROM ECONOMIC REPORTS (RAG) ===
+{rag_context}
+
+Respond with a JSON object of exactly this form:
+{{
+  "summaries": {{"<indicator code>": "<2–3 sentence summary>", ...}},
+  "analysis": "<final combined economic analysis>"
+}}
+
+Each summary describes the trend, direction and any notable movements
+of one indicator in the macro data above.
+
+The analysis (5–8 sentences), based on BOTH the macroeconomic data AND
+the report excerpts, should:
+- integrate the macro trends,
+- integrate the report context,
+- explain risks, drivers, and outlook,
+- avoid repeating raw data verbatim,
+- sound like a professional economic analyst.
+"""
+
+
+async def _fused_completion(prompt: str, indicators: list):
+    """
+    Single structured completion. Returns (summaries by indicator, analysis),
+    or None if the response does not parse.
+    """
+    response = await chat_completion(
         model=MODEL,
-        messages=[{"role": "user", "content": final_prompt}],
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
     )
 
-    combined_answer = final_response.choices[0].message.content
+    try:
+        parsed = json.loads(response.choices[0].message.content)
+        summaries = parsed["summaries"]
+        analysis = parsed["analysis"]
+    except (TypeError, KeyError, ValueError):
+        return None
+
+    if not isinstance(analysis, str) or not isinstance(summaries, dict):
+        return None
+    if any(not isinstance(summaries.get(i), str) for i in indicators):
+        return None
+
+    return summaries, analysis
+
+
+async def analyze_economy(query: str, country: str = None, with_timings: bool = False, fused: bool = None):
+    """
+    Main economic reasoning pipeline:
+    - Detect country
+    - Detect relevant indicators
+    - Fetch macro data and summarize each indicator with the LLM
+    - Retrieve RAG evidence from reports (scoped to the named country first)
+    - Produce a final combined economic analysis
+
+    Indicator branches (fetch → summary) and the RAG lookup run concurrently;
+    the final synthesis starts once all of them are done. With with_timings=True
+    a per-stage timing breakdown and the critical path are included.
+
+    In fused mode (default: AGENT_FUSED_MODE) the per-indicator summaries and
+    the final analysis come from one JSON completion instead of one call per
+    indicator plus synthesis. If that response cannot be parsed, the standard
+    path is used for the summaries and synthesis.
+    """
+    if fused is None:
+        fused = AGENT_FUSED_MODE
+
+    t0 = time.perf_counter()
+    stages = {}
+
+    with metrics.stage_timer("detect"):
+        # ---- COUNTRY DETECTION ----
+        detected_country = detect_country(query, default=country or "US")
+        # Report retrieval is only scoped to a country the query or caller named
+        rag_country = detect_country(query, default=country)
+        country = detected_country.upper()
+
+        # ---- INDICATOR DETECTION ----
+        indicator_list = detect_indicators(query)
+
+    # ---- MACRO DATA (+ SUMMARIES), RAG CONTEXT (concurrently) ----
+    *branches, rag_context = await asyncio.gather(
+        *(_indicator_branch(country, indicator, stages, t0, not fused) for indicator in indicator_list),
+        _rag_branch(query, stages, t0, rag_country),
+    )
+
+    collected_data = []
+    summaries = []
+
+    for summary, data in branches:
+        summaries.append(summary)
+        if data is not None:
+            collected_data.append(data)
+
+    combined_answer = None
+
+    # ---- FUSED SUMMARIES + SYNTHESIS ----
+    if fused:
+        errors = [s for s in summaries if s is not None]
+        prompt = _fused_prompt(query, country, collected_data, errors, rag_context)
+
+        with _stage(stages, "fused", "synthesis", t0):
+            fused_result = await _fused_completion(prompt, [d["indicator"] for d in collected_data])
+
+        if fused_result is not None:
+            by_indicator, combined_answer = fused_result
+            summaries = [
+                s if s is not None else f"Indicator {indicator}:\n{by_indicator[indicator]}"
+                for s, indicator in zip(summaries, indicator_list)
+            ]
+        else:
+            # Unparseable response: summarize each indicator the standard way
+            raw_by_indicator = {d["indicator"]: d["values"] for d in collected_data}
+            for i, indicator in enumerate(indicator_list):
+                if summaries[i] is None:
+                    with _stage(stages, f"summarize:{indicator}", "synthesis", t0):
+                        summary = await summarize_indicator(country, indicator, raw_by_indicator[indicator])
+                    summaries[i] = f"Indicator {indicator}:\n{summary}"
+
+    # ---- FINAL SYNTHESIS ----
+    if combined_answer is None:
+        final_prompt = _synthesis_prompt(query, country, indicator_list, summaries, rag_context)
+
+        with _stage(stages, "synthesis", "synthesis", t0):
+            final_response = await chat_completion(
+                model=MODEL,
+                messages=[{"role": "user", "content": final_prompt}],
+            )
+
+        combined_answer = final_response.choices[0].message.content
 
-    return {
+    result = {
         "country": country,
         "indicators_used": indicator_list,
         "analysis": combined_answer,
@@ -170,3 +338,98 @@ Your answer should:
         "raw_summaries": summaries,
         "raw_data": collected_data
     }
+
+    if with_timings:
+        result["timings"] = {
+            "total": round(time.perf_counter() - t0, 4),
+            "stages": stages,
+            "critical_path": _critical_path(stages),
+        }
+
+    return result
+
+
+async def stream_economy(query: str, country: str = None):
+    """
+    Streaming version of analyze_economy (standard mode).
+
+    Yields (event, data) pairs as the pipeline progresses:
+    "country", "indicators", one "indicator" per finished branch, "rag",
+    "token" deltas of the final analysis, then "done" with the same
+    payload analyze_economy returns.
+    """
+    t0 = time.perf_counter()
+    stages = {}
+
+    # ---- COUNTRY + INDICATOR DETECTION ----
+    with metrics.stage_timer("detect"):
+        detected_country = detect_country(query, default=country or "US")
+        # Report retrieval is only scoped to a country the query or caller named
+        rag_country = detect_country(query, default=country)
+        country = detected_country.upper()
+        indicator_list = detect_indicators(query)
+
+    yield "country", {"country": country}
+    yield "indicators", {"indicators": indicator_list}
+
+    # ---- MACRO DATA + SUMMARIES, RAG CONTEXT (concurrently) ----
+    branch_tasks = {
+        asyncio.ensure_future(_indicator_branch(country, indicator, stages, t0)): i
+        for i, indicator in enumerate(indicator_list)
+    }
+    rag_task = asyncio.ensure_future(_rag_branch(query, stages, t0, rag_country))
+
+    summaries = [None] * len(indicator_list)
+    raw = [None] * len(indicator_list)
+    rag_context = ""
+
+    pending = {*branch_tasks, rag_task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is rag_task:
+                    rag_context = task.result()
+                    yield "rag", {"passages": rag_context}
+                    continue
+
+                i = branch_tasks[task]
+                summaries[i], raw[i] = task.result()
+                yield "indicator", {
+                    "indicator": indicator_list[i],
+                    "summary": summaries[i],
+                    "values": raw[i]["values"] if raw[i] else [],
+                }
+    finally:
+        # Client disconnected mid-stream: don't leave branches running
+        for task in pending:
+            task.cancel()
+
+    collected_data = [d for d in raw if d is not None]
+
+    # ---- FINAL SYNTHESIS (streamed) ----
+    # Timed until the last token, not just the first response
+    parts = []
+    with _stage(stages, "synthesis", "synthesis", t0):
+        stream = await chat_completion(
+            model=MODEL,
+            messages=[{"role": "user", "content": _synthesis_prompt(query, country, indicator_list, summaries, rag_context)}],
+            stream=True,
+        )
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield "token", {"text": delta}
+
+    yield "done", {
+        "country": country,
+        "indicators_used": indicator_list,
+        "analysis": "".join(parts),
+        "rag_passages": rag_context,
+        "raw_summaries": summaries,
+        "raw_data": collected_data
+    }
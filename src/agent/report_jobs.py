@@ -0,0 +1,279 @@
+# src/agent/report_jobs.py
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from src.backend.config import MODEL, REPORTS_DIR, REPORTS_MAX_FILES, REPORT_WORKERS, REPORT_JOBS_MAX
+from src.agent.economic_agent import analyze_economy, detect_indicators
+from src.backend.rags.rag_store import corpus_version
+from src.backend.tools import metrics
+from src.backend.tools.country_map import detect_country
+from src.backend.tools.macro_fetcher import cached_series, aget_indicator
+from src.backend.tools.pdf_generator import generate_economic_report
+
+# Jobs are asyncio tasks on the server loop; at most REPORT_WORKERS run at once.
+# All state below is only touched from that loop, so it needs no locking.
+_slots = asyncio.Semaphore(REPORT_WORKERS)
+_tasks = set()
+
+# job_id -> job dict, oldest first; finished jobs beyond REPORT_JOBS_MAX are dropped
+jobs = OrderedDict()
+# job_id -> event set when the job finishes
+_finished = {}
+# Identical queued/running requests share one job: flight key -> job_id,
+# where the flight key is the artifact key, or the query/country alone
+# while the data version is still unknown
+_in_flight = {}
+_flights = {}
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _resolve(query: str, country: str = None):
+    """
+    Country and indicators exactly as analyze_economy will pick them.
+    """
+    return detect_country(query, default=country or "US").upper(), detect_indicators(query)
+
+
+def data_version(country: str, indicators: list):
+    """
+    Hash of the inputs a report is built from: the cached series it uses,
+    the ingested report corpus and the model. None if a series isn't cached
+    or has expired: the job fetches it again before the key is known.
+    """
+    series = {}
+    for indicator in indicators:
+        data = cached_series(country, indicator)
+        if data is None:
+            return None
+        series[indicator] = data.to_columns()
+
+    payload = json.dumps({"series": series, "corpus": corpus_version(), "model": MODEL}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_key(query: str, country: str, version: str) -> str:
+    payload = json.dumps([_normalize_query(query), country, version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_path(key: str) -> str:
+    return os.path.join(REPORTS_DIR, f"{key}.pdf")
+
+
+def _reuse(path: str) -> bool:
+    """
+    Whether the artifact exists; if so it is marked recently used, so
+    _prune_artifacts keeps it.
+    """
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+def _lookup(query: str, country: str, indicators: list):
+    """
+    (artifact key or None, whether its PDF can be reused). Reads the series
+    cache, the ingest manifest and REPORTS_DIR, so it runs in a worker thread.
+    """
+    version = data_version(country, indicators)
+    if version is None:
+        return None, False
+    key = artifact_key(query, country, version)
+    return key, _reuse(artifact_path(key))
+
+
+def _prune_artifacts():
+    """
+    Delete the least recently used PDFs above REPORTS_MAX_FILES: artifacts
+    of superseded data versions are never requested again. Runs in a worker
+    thread after each render.
+    """
+    entries = []
+    with os.scandir(REPORTS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".pdf"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+
+    entries.sort()
+    for _, path in entries[:max(len(entries) - REPORTS_MAX_FILES, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _new_job(query: str, country: str, fused) -> dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "query": query,
+        "country": country,
+        "fused": fused,
+        "key": None,
+        "artifact": None,
+        "cached": False,
+        "error": None,
+        "created": time.time(),
+        "started": None,
+        "finished": None,
+    }
+
+
+def _finish(job: dict, status: str, error: str = None):
+    job["status"] = status
+    job["error"] = error
+    job["finished"] = time.time()
+    for flight in _flights.pop(job["id"], []):
+        if _in_flight.get(flight) == job["id"]:
+            del _in_flight[flight]
+    _finished.pop(job["id"]).set()
+
+
+def _trim():
+    """
+    Drop the oldest finished jobs above REPORT_JOBS_MAX.
+    Their artifacts stay on disk and are reused by later identical requests.
+    """
+    overflow = len(jobs) - REPORT_JOBS_MAX
+    for job_id in [j for j, job in jobs.items() if job["status"] in ("done", "failed")][:max(overflow, 0)]:
+        del jobs[job_id]
+
+
+async def submit(query: str, country: str = None, fused: bool = None) -> dict:
+    """
+    Enqueue a report. Returns the job, which is already "done" when a PDF for
+    the same query, country and data version exists, and is shared with an
+    identical job that is still queued or running.
+    """
+    resolved_country, indicators = _resolve(query, country)
+    # Nothing below awaits, so identical submits can't both miss _in_flight
+    key, reusable = await asyncio.to_thread(_lookup, query, resolved_country, indicators)
+    flight = key or artifact_key(query, resolved_country, None)
+
+    if flight in _in_flight:
+        return dict(jobs[_in_flight[flight]])
+
+    job = _new_job(query, resolved_country, fused)
+    job["key"] = key
+    job["artifact"] = artifact_path(key) if key else None
+    jobs[job["id"]] = job
+    _trim()
+
+    if reusable:
+        job.update(status="done", cached=True, finished=job["created"])
+        return dict(job)
+
+    _in_flight[flight] = job["id"]
+    _flights[job["id"]] = [flight]
+    _finished[job["id"]] = asyncio.Event()
+
+    task = asyncio.create_task(_run(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return dict(job)
+
+
+def _render(path: str, tmp_path: str, result: dict):
+    """
+    Render to a private temp file and publish atomically: concurrent jobs
+    never see or overwrite a half-written PDF. Runs in a worker thread.
+    """
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    try:
+        with metrics.stage_timer("render_pdf"):
+            generate_economic_report(
+                filepath=tmp_path,
+                country=result["country"],
+                indicators=result["indicators_used"],
+                analysis=result["analysis"],
+                rag_passages=result["rag_passages"],
+            )
+        os.replace(tmp_path, path)
+        _prune_artifacts()
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+async def _run(job: dict):
+    async with _slots:
+        await _execute(job)
+
+
+async def _execute(job: dict):
+    job["status"] = "running"
+    job["started"] = time.time()
+
+    try:
+        # Warm the series cache first so the final key is known before any LLM call
+        _, indicators = _resolve(job["query"], job["country"])
+        await asyncio.gather(*(aget_indicator(job["country"], indicator) for indicator in indicators))
+
+        # A series that failed to fetch isn't cached: such a report is kept
+        # under the job's own name and never reused
+        key, reusable = await asyncio.to_thread(_lookup, job["query"], job["country"], indicators)
+        path = artifact_path(key or f"job_{job['id']}")
+
+        job["key"] = key
+        job["artifact"] = path
+        # Requests arriving now resolve to the real key; let them join this job
+        if key is not None and key not in _in_flight:
+            _in_flight[key] = job["id"]
+            _flights[job["id"]].append(key)
+
+        if reusable:
+            job["cached"] = True
+            _finish(job, "done")
+            return
+
+        result = await analyze_economy(job["query"], job["country"], fused=job["fused"])
+
+        await asyncio.to_thread(_render, path, f"{path}.{job['id']}.tmp", result)
+
+        _finish(job, "done")
+    except asyncio.CancelledError:
+        _finish(job, "failed", "Cancelled")
+        raise
+    except Exception as e:
+        _finish(job, "failed", f"{e.__class__.__name__}: {e}")
+
+
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    return dict(job) if job else None
+
+
+async def wait(job_id: str, timeout: float = None):
+    """
+    Wait until the job finishes (or timeout seconds pass); returns the job.
+    """
+    event = _finished.get(job_id)
+    if event is not None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return get_job(job_id)
+
+
+async def shutdown():
+    """
+    Cancel running jobs (called from the app lifespan on shutdown).
+    """
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
@@ -7,6 +7,91 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("MODEL", "gpt-4o-mini")
+# Point at any OpenAI-compatible server (e.g. a local fake for load tests)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+# Concurrent model requests are bounded by this pool, not by worker threads
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 200))
 
-if OPENAI_API_KEY is None:
-    raise ValueError("OPENAI_API_KEY is not set in .env")
+# Local on-disk caches
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+# World Bank API root (point at a local stand-in for offline benchmarks)
+WB_API_URL = os.getenv("WB_API_URL", "https://api.worldbank.org/v2").rstrip("/")
+# Rows per World Bank page (upstream default is 50) and pages fetched at once
+WB_PER_PAGE = int(os.getenv("WB_PER_PAGE", 1000))
+WB_PAGE_CONCURRENCY = int(os.getenv("WB_PAGE_CONCURRENCY", 4))
+
+# World Bank series cache (seconds)
+WB_CACHE_TTL = int(os.getenv("WB_CACHE_TTL", 24 * 3600))
+WB_CACHE_STALE_TTL = int(os.getenv("WB_CACHE_STALE_TTL", 7 * 24 * 3600))
+WB_CACHE_MAX_ENTRIES = int(os.getenv("WB_CACHE_MAX_ENTRIES", 5000))
+
+# LLM completion cache
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+
+# Shared outbound HTTP client (World Bank)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))
+# Longest wait between retries; a longer Retry-After means give up instead
+HTTP_MAX_BACKOFF = float(os.getenv("HTTP_MAX_BACKOFF", 5))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 10))
+
+# Agent pipeline
+# One JSON completion for all summaries + final analysis
+AGENT_FUSED_MODE = os.getenv("AGENT_FUSED_MODE", "false").lower() in ("1", "true", "yes")
+
+# Background report jobs (PDF artifacts are keyed by query, country and data version)
+REPORTS_DIR = os.getenv("REPORTS_DIR", "reports_out")
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 2))
+REPORT_JOBS_MAX = int(os.getenv("REPORT_JOBS_MAX", 1000))
+# PDFs kept in REPORTS_DIR; the least recently used are deleted above this
+REPORTS_MAX_FILES = int(os.getenv("REPORTS_MAX_FILES", 500))
+
+# RAG ingestion
+RAG_INGEST_WORKERS = int(os.getenv("RAG_INGEST_WORKERS", os.cpu_count() or 1))
+RAG_INGEST_BATCH_SIZE = int(os.getenv("RAG_INGEST_BATCH_SIZE", 256))
+
+# In-memory cache of query embeddings and top-k results
+RAG_QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", 1024))
+
+# Retrieval: "vector" or "hybrid" (BM25 + vector, fused with reciprocal rank)
+RAG_SEARCH_MODE = os.getenv("RAG_SEARCH_MODE", "vector").lower()
+RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", 20))
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", 60))
+
+# Re-ranking: Maximal Marginal Relevance over RAG_MMR_CANDIDATES, dropping
+# near-duplicates above RAG_DUPLICATE_THRESHOLD cosine similarity
+RAG_MMR_ENABLED = os.getenv("RAG_MMR_ENABLED", "true").lower() in ("1", "true", "yes")
+RAG_MMR_LAMBDA = float(os.getenv("RAG_MMR_LAMBDA", 0.7))
+RAG_MMR_CANDIDATES = int(os.getenv("RAG_MMR_CANDIDATES", 20))
+RAG_DUPLICATE_THRESHOLD = float(os.getenv("RAG_DUPLICATE_THRESHOLD", 0.95))
+# Merge neighbouring chunks of the same report into one passage for the LLM
+RAG_MERGE_ADJACENT = os.getenv("RAG_MERGE_ADJACENT", "true").lower() in ("1", "true", "yes")
+
+# Upper bound on queries per POST /rag/search/batch request
+RAG_BATCH_MAX_QUERIES = int(os.getenv("RAG_BATCH_MAX_QUERIES", 1000))
+
+# Embeddings for the report collection ("local" ONNX on CPU or "openai")
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "local").lower()
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 64))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", 0))
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Per-request profiling (X-Profile: 1 or ?profile=1, plus X-Admin-Token).
+# Disabled unless an admin token is set.
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN") or None
+PROFILES_DIR = os.getenv("PROFILES_DIR", os.path.join(CACHE_DIR, "profiles"))
+PROFILES_MAX = int(os.getenv("PROFILES_MAX", 50))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", 0.005))
+
+# Print import and startup timings (see benchmarks/startup_time.py)
+STARTUP_TIMING = os.getenv("STARTUP_TIMING", "false").lower() in ("1", "true", "yes")
+# Build the LLM client, vector store and embeddings in the background right
+# after startup, so the first request doesn't pay for it. Off: built on first use.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
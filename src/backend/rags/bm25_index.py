@@ -0,0 +1,135 @@
+# src/backend/rags/bm25_index.py
+
+import os
+import re
+from collections import Counter
+import numpy as np
+
+# Keeps macro terms intact: "hicp", "nairu", "2024", "2.5", "covid-19"
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index stored as flat NumPy arrays (CSR layout):
+    term t's postings are doc_ids[offsets[t]:offsets[t + 1]] with matching tfs.
+    """
+
+    def __init__(self, ids, terms, offsets, doc_ids, tfs, doc_lengths, k1=1.5, b=0.75):
+        self.ids = list(ids)
+        self.term_index = {term: i for i, term in enumerate(terms)}
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+
+        n_docs = len(self.ids)
+        df = np.diff(offsets).astype(np.float64)
+        self.idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        self.avgdl = float(doc_lengths.mean()) if n_docs else 0.0
+
+    @classmethod
+    def build(cls, ids: list, texts: list, **params) -> "BM25Index":
+        postings = {}
+        doc_lengths = np.zeros(len(ids), dtype=np.int32)
+
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths[doc] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        for i, term in enumerate(terms):
+            offsets[i + 1] = offsets[i] + len(postings[term])
+
+        doc_ids = np.empty(offsets[-1], dtype=np.int32)
+        tfs = np.empty(offsets[-1], dtype=np.uint16)
+        for i, term in enumerate(terms):
+            docs, counts = zip(*postings[term])
+            doc_ids[offsets[i]:offsets[i + 1]] = docs
+            tfs[offsets[i]:offsets[i + 1]] = np.minimum(counts, np.iinfo(np.uint16).max)
+
+        return cls(ids, terms, offsets, doc_ids, tfs, doc_lengths, **params)
+
+    def search(self, query: str, n: int = 10) -> list:
+        """
+        Return up to n (id, score) pairs, best first.
+        """
+        if not self.ids:
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float64)
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths / (self.avgdl or 1.0))
+
+        for term in set(tokenize(query)):
+            t = self.term_index.get(term)
+            if t is None:
+                continue
+            docs = self.doc_ids[self.offsets[t]:self.offsets[t + 1]]
+            tf = self.tfs[self.offsets[t]:self.offsets[t + 1]].astype(np.float64)
+            # Each doc appears once per term, so plain fancy-index addition is safe
+            scores[docs] += self.idf[t] * tf * (self.k1 + 1.0) / (tf + norm[docs])
+
+        hits = np.flatnonzero(scores)
+        if not len(hits):
+            return []
+
+        n = min(n, len(hits))
+        top = hits[np.argpartition(-scores[hits], n - 1)[:n]]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            ids=np.array(self.ids, dtype=object),
+            terms=np.array(self.terms, dtype=object),
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            tfs=self.tfs,
+            doc_lengths=self.doc_lengths,
+            params=np.array([self.k1, self.b]),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with np.load(path, allow_pickle=True) as data:
+            k1, b = data["params"]
+            return cls(
+                data["ids"].tolist(),
+                data["terms"].tolist(),
+                data["offsets"],
+                data["doc_ids"],
+                data["tfs"],
+                data["doc_lengths"],
+                k1=float(k1),
+                b=float(b),
+            )
+
+
+def reciprocal_rank_fusion(rankings: list, k: int = 60) -> list:
+    """
+    Fuse several ranked id lists: score(id) = sum(1 / (k + rank)).
+    Returns (id, score) pairs, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,54 @@
+# src/backend/rags/chunk_metadata.py
+#
+# Cheap text heuristics run inside the extraction workers.
+
+import re
+from collections import Counter
+from src.backend.tools.query_parser import iter_matches
+
+# Publisher → phrases that identify it in a file name or on the first page
+PUBLISHERS = {
+    "ECB": ["ecb", "european central bank"],
+    "OECD": ["oecd", "organisation for economic co-operation"],
+    "IMF": ["imf", "international monetary fund"],
+    "World Bank": ["world bank", "worldbank"],
+    "Federal Reserve": ["federal reserve", "fomc"],
+    "Bank of England": ["bank of england", "boe"],
+    "BIS": ["bank for international settlements"],
+    "Eurostat": ["eurostat"],
+}
+
+_PUBLISHER_RES = {
+    publisher: re.compile(r"\b(" + "|".join(re.escape(p) for p in phrases) + r")\b", re.IGNORECASE)
+    for publisher, phrases in PUBLISHERS.items()
+}
+
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+
+
+def detect_publisher(file_name: str, first_page: str):
+    """
+    Publisher named in the file name, else the one mentioned most on the first page.
+    """
+    stem = re.sub(r"[_\-.]+", " ", file_name)
+    for publisher, pattern in _PUBLISHER_RES.items():
+        if pattern.search(stem):
+            return publisher
+
+    counts = Counter()
+    for publisher, pattern in _PUBLISHER_RES.items():
+        counts[publisher] = len(pattern.findall(first_page))
+    publisher, count = counts.most_common(1)[0]
+    return publisher if count else None
+
+
+def count_countries(text: str) -> Counter:
+    return Counter(code for kind, code in iter_matches(text) if kind == "country")
+
+
+def count_years(text: str) -> Counter:
+    return Counter(int(y) for y in YEAR_RE.findall(text))
+
+
+def most_common(counts: Counter, default=None):
+    return counts.most_common(1)[0][0] if counts else default
@@ -0,0 +1,256 @@
+# src/backend/rags/embeddings.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import cached_property
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2, register_embedding_function
+from src.backend.config import (
+    CACHE_DIR,
+    EMBEDDING_PROVIDER,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_THREADS,
+    OPENAI_EMBEDDING_MODEL,
+)
+from src.backend.tools import metrics
+
+
+class VectorCache:
+    """
+    Persistent store of embedding vectors keyed by (model, chunk text hash).
+    Vectors never expire: the same text under the same model embeds the same.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vectors (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: list) -> dict:
+        """
+        Return {hash: float32 vector} for the hashes that are cached.
+        """
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM vectors WHERE model = ? AND hash IN ({placeholders})",
+                    (model, *batch),
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+            self._counters["hits"] += sum(1 for h in hashes if h in found)
+            self._counters["misses"] += sum(1 for h in hashes if h not in found)
+
+        return found
+
+    def put_many(self, model: str, items: dict):
+        """
+        Store {hash: vector}.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (model, hash, vector) VALUES (?, ?, ?)",
+                [(model, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in items.items()],
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            stats = dict(self._counters)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["entries"] = entries
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class _ThreadedMiniLM(ONNXMiniLM_L6_V2):
+    """
+    Chroma's bundled all-MiniLM-L6-v2 ONNX model with a configurable
+    intra-op thread count (0 = onnxruntime default).
+    """
+
+    def __init__(self, intra_op_threads: int = 0):
+        super().__init__(preferred_providers=["CPUExecutionProvider"])
+        self._intra_op_threads = intra_op_threads
+
+    @cached_property
+    def model(self):
+        so = self.ort.SessionOptions()
+        so.log_severity_level = 3
+        so.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self._intra_op_threads:
+            so.intra_op_num_threads = self._intra_op_threads
+
+        return self.ort.InferenceSession(
+            os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx"),
+            providers=["CPUExecutionProvider"],
+            sess_options=so,
+        )
+
+
+class LocalOnnxBackend:
+    """
+    CPU embeddings with onnxruntime + tokenizers. Produces the same vectors as
+    Chroma's default embedding function, so existing collections stay valid.
+    """
+
+    provider = "local"
+    model_name = ONNXMiniLM_L6_V2.MODEL_NAME
+
+    def __init__(self, batch_size: int, threads: int):
+        self.batch_size = batch_size
+        self._model = _ThreadedMiniLM(intra_op_threads=threads)
+
+    def embed(self, texts: list) -> np.ndarray:
+        self._model._download_model_if_not_exists()
+        return self._model._forward(texts, batch_size=self.batch_size)
+
+    def warm_up(self):
+        """
+        Load the ONNX session now instead of on the first cache miss.
+        """
+        self._model._download_model_if_not_exists()
+        self._model.model
+
+
+class OpenAIBackend:
+    """
+    Remote embeddings through the OpenAI API.
+    """
+
+    provider = "openai"
+
+    def __init__(self, batch_size: int, model: str):
+        from langchain_openai import OpenAIEmbeddings
+
+        self.batch_size = batch_size
+        self.model_name = model
+        self._client = OpenAIEmbeddings(model=model, chunk_size=batch_size)
+
+    def embed(self, texts: list) -> np.ndarray:
+        return np.asarray(self._client.embed_documents(texts), dtype=np.float32)
+
+    def warm_up(self):
+        pass
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Chroma embedding function: looks every text up in the vector cache and
+    only sends misses to the backend, in batches of the backend's batch size.
+    """
+
+    def __init__(self, backend, cache: VectorCache):
+        self.backend = backend
+        self.cache = cache
+
+    def __call__(self, input: Documents) -> Embeddings:
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in input]
+        found = self.cache.get_many(self.backend.model_name, hashes)
+
+        missing = {}
+        for h, text in zip(hashes, input):
+            if h not in found:
+                missing.setdefault(h, text)
+
+        todo = list(missing.items())
+        for i in range(0, len(todo), self.backend.batch_size):
+            batch = todo[i:i + self.backend.batch_size]
+            vectors = self.backend.embed([text for _, text in batch])
+            computed = {h: v for (h, _), v in zip(batch, vectors)}
+            self.cache.put_many(self.backend.model_name, computed)
+            found.update(computed)
+
+        return [np.asarray(found[h], dtype=np.float32) for h in hashes]
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        """
+        Search queries go straight to the backend. They are one-off texts, so
+        storing them would only grow the vector cache with every new query;
+        rag_store keeps recent ones in its in-memory LRU instead.
+        """
+        vectors = []
+        for i in range(0, len(input), self.backend.batch_size):
+            vectors.extend(self.backend.embed(list(input[i:i + self.backend.batch_size])))
+        return [np.asarray(v, dtype=np.float32) for v in vectors]
+
+    @staticmethod
+    def name() -> str:
+        # Chroma persists this name with the collection and rebuilds the
+        # function from it on reopen, so it must not claim to be "default"
+        return "cached-minilm" if EMBEDDING_PROVIDER == "local" else f"economic_agent_{EMBEDDING_PROVIDER}"
+
+    def get_config(self) -> dict:
+        return {"provider": self.backend.provider, "model": self.backend.model_name}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "CachedEmbeddingFunction":
+        return get_embedding_function()
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def supported_spaces(self) -> list:
+        return ["cosine", "l2", "ip"]
+
+
+# Lets Chroma rebuild this function (via build_from_config) for a collection
+# opened without one
+register_embedding_function(CachedEmbeddingFunction)
+
+
+_embedding_function = None
+_lock = threading.Lock()
+
+
+def get_embedding_function() -> CachedEmbeddingFunction:
+    """
+    Process-wide embedding function for the configured EMBEDDING_PROVIDER.
+    """
+    global _embedding_function
+
+    with _lock:
+        if _embedding_function is None:
+            if EMBEDDING_PROVIDER == "local":
+                backend = LocalOnnxBackend(EMBEDDING_BATCH_SIZE, EMBEDDING_THREADS)
+            elif EMBEDDING_PROVIDER == "openai":
+                backend = OpenAIBackend(EMBEDDING_BATCH_SIZE, OPENAI_EMBEDDING_MODEL)
+            else:
+                raise ValueError(f"Unknown EMBEDDING_PROVIDER: {EMBEDDING_PROVIDER}")
+
+            cache = VectorCache(os.path.join(CACHE_DIR, "embeddings.sqlite"))
+            _embedding_function = CachedEmbeddingFunction(backend, cache)
+            metrics.register_cache("embeddings", cache.stats)
+
+    return _embedding_function
+
@@ -0,0 +1,370 @@
+# src/backend/rags/pdf_extract.py
+#
+# Kept free of vector-store imports so process-pool workers stay light.
+# pypdf and the text splitter are imported on first use, not at server start.
+
+import json
+import os
+import tempfile
+from bisect import bisect_right
+from collections import Counter, deque
+from src.backend.rags.chunk_metadata import (
+    detect_publisher,
+    count_countries,
+    count_years,
+    most_common,
+)
+
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 150
+SEPARATORS = ["\n\n", "\n", ".", " "]
+
+
+def _make_splitter(separators=SEPARATORS) -> "RecursiveCharacterTextSplitter":
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=separators
+    )
+
+
+def iter_page_texts(pdf_path: str):
+    """
+    Yield the text of each non-empty page (newline-terminated), one page at a time.
+    """
+    from pypdf import PdfReader
+
+    return _iter_reader_pages(PdfReader(pdf_path))
+
+
+def _iter_reader_pages(reader: "PdfReader"):
+    for _, content in _iter_numbered_pages(reader):
+        yield content
+
+
+def _iter_numbered_pages(reader: "PdfReader"):
+    """
+    Yield (1-based page number, text) for each non-empty page.
+    """
+    for number, page in enumerate(reader.pages, start=1):
+        content = page.extract_text()
+        if content:
+            yield number, content + "\n"
+
+
+def extract_text_from_pdf(pdf_path: str) -> str:
+    """
+    Extract all text from a PDF using pypdf.
+    """
+    return "".join(iter_page_texts(pdf_path))
+
+
+def chunk_text(text: str) -> list:
+    """
+    Split long text into smaller chunks for embedding.
+    """
+    splitter = _make_splitter()
+
+    chunks = splitter.split_text(text)
+    return chunks
+
+
+class _RollingMerger:
+    """
+    Incremental form of TextSplitter._merge_splits: holds only the splits of
+    the chunk being built (plus its overlap) instead of the whole document.
+    The splitter keeps separators on the splits, so the join separator is "".
+    """
+
+    def __init__(self):
+        self.current = deque()
+        self.total = 0
+
+    def add(self, split: str):
+        length = len(split)
+
+        if self.total + length > CHUNK_SIZE and self.current:
+            doc = "".join(self.current).strip()
+            if doc:
+                yield doc
+            # Keep popping until only the overlap window remains
+            while self.total > CHUNK_OVERLAP or (self.total + length > CHUNK_SIZE and self.total > 0):
+                self.total -= len(self.current.popleft())
+
+        self.current.append(split)
+        self.total += length
+
+    def flush(self):
+        doc = "".join(self.current).strip()
+        if doc:
+            yield doc
+        self.current.clear()
+        self.total = 0
+
+
+def _iter_pieces(fragments, separator: str):
+    """
+    Stream the pieces re.split would produce on "".join(fragments) with the
+    separator kept at the start of each piece, as (starts_piece, text) parts.
+    A piece may arrive in several parts, so none is ever held whole: only the
+    current fragment and a possible partial separator at its end are kept.
+    """
+    pending = ""
+    offset = 0  # position of pending in the joined text
+    search = 0  # no match can start before this position
+    starts = True
+    keep = len(separator) - 1
+
+    for text in fragments:
+        pending += text
+
+        index = pending.find(separator, max(search - offset, 0))
+        while index != -1:
+            if index > 0:
+                yield starts, pending[:index]
+            starts = True
+            pending = pending[index:]
+            offset += index
+            search = offset + len(separator)
+            index = pending.find(separator, search - offset)
+
+        # Pass on what can no longer be part of a match
+        safe = max(len(pending) - keep, min(search - offset, len(pending)))
+        if safe > 0:
+            yield starts, pending[:safe]
+            starts = False
+            pending = pending[safe:]
+            offset += safe
+
+    if pending:
+        yield starts, pending
+
+
+class _Pieces:
+    """
+    _iter_pieces with one part of lookahead, read piece by piece.
+    """
+
+    def __init__(self, fragments, separator: str):
+        self._parts = _iter_pieces(fragments, separator)
+        self._head = next(self._parts, None)
+
+    def start(self):
+        """
+        The first part of the next piece, or None at the end.
+        """
+        if self._head is None:
+            return None
+        text = self._head[1]
+        self._head = next(self._parts, None)
+        return text
+
+    def more(self):
+        """
+        The next part of the current piece, or None once it has ended.
+        """
+        if self._head is None or self._head[0]:
+            return None
+        text = self._head[1]
+        self._head = next(self._parts, None)
+        return text
+
+    def rest(self):
+        text = self.more()
+        while text is not None:
+            yield text
+            text = self.more()
+
+
+def _prepend(first: str, rest):
+    yield first
+    yield from rest
+
+
+def iter_chunks(pages, separator: str, separators=SEPARATORS):
+    """
+    Yield exactly the chunks chunk_text("".join(pages)) would return, given the
+    top-level separator the splitter would pick for that text (the first of
+    SEPARATORS present in it).
+
+    Pieces too long for one chunk are split the same way one level down,
+    streamed rather than joined: a piece is held only until it ends, reaches
+    CHUNK_SIZE, or (once oversized) shows which finer separator it contains.
+    Page text always ends in a newline, so memory stays within about one
+    page plus CHUNK_SIZE (see benchmarks/bench_chunking.py).
+    """
+    remaining = separators[separators.index(separator) + 1:]
+    merger = _RollingMerger()
+    pieces = _Pieces(pages, separator)
+
+    piece = pieces.start()
+    while piece is not None:
+        # Hold the piece until it ends or is known to be oversized
+        text = pieces.more() if len(piece) < CHUNK_SIZE else None
+        while text is not None:
+            piece += text
+            text = pieces.more() if len(piece) < CHUNK_SIZE else None
+
+        if len(piece) < CHUNK_SIZE:
+            yield from merger.add(piece)
+            piece = pieces.start()
+            continue
+
+        # Oversized piece: close the running chunk and split the piece one level down
+        yield from merger.flush()
+        if not remaining:
+            yield piece + "".join(pieces.rest())
+        else:
+            # The splitter uses the first finer separator found in the piece
+            text = pieces.more() if remaining[0] not in piece else None
+            while text is not None:
+                piece += text
+                text = pieces.more() if remaining[0] not in piece else None
+            found = next((s for s in remaining if s in piece), remaining[-1])
+            yield from iter_chunks(_prepend(piece, pieces.rest()), found, remaining)
+
+        piece = pieces.start()
+
+    yield from merger.flush()
+
+
+class _ChunkLocator:
+    """
+    Map chunks back to the pages they came from. Chunks are substrings of the
+    joined page text in increasing start order, so each one is searched for
+    from the previous chunk's start in a buffer trimmed as chunks go by.
+    """
+
+    def __init__(self, page_numbers: list, page_lengths: list):
+        self.page_numbers = page_numbers
+        self.page_starts = []
+        offset = 0
+        for length in page_lengths:
+            self.page_starts.append(offset)
+            offset += length
+
+        self.buffer = ""
+        self.buffer_offset = 0
+        self.last_start = 0
+
+    def feed(self, text: str):
+        self.buffer += text
+
+    def locate(self, chunk: str):
+        """
+        Return (first page, last page) covered by the chunk.
+        """
+        index = self.buffer.find(chunk, self.last_start - self.buffer_offset)
+        start = self.buffer_offset + max(index, 0)
+        end = start + max(len(chunk) - 1, 0)
+
+        self.last_start = start
+        self.buffer = self.buffer[start - self.buffer_offset:]
+        self.buffer_offset = start
+
+        return self._page_at(start), self._page_at(end)
+
+    def _page_at(self, offset: int) -> int:
+        return self.page_numbers[bisect_right(self.page_starts, offset) - 1]
+
+
+def spool_pdf_chunks(pdf_path: str, chunks_path: str):
+    """
+    Stream one PDF page by page into chunks written to chunks_path (JSON lines
+    of {"text", "page_start", "page_end", "country", "year"}).
+
+    Pass 1 spools page text to a temp file while detecting which separator the
+    splitter would pick and counting country/year mentions; pass 2 reads pages
+    back and streams them through the rolling splitter. A chunk's country and
+    year are the ones it mentions most, else the document's.
+    Returns (chunk count, page count, document metadata).
+    """
+    page_numbers = []
+    page_lengths = []
+    present = set()
+    tail = ""
+    first_page = ""
+    doc_countries = Counter()
+    doc_years = Counter()
+
+    from pypdf import PdfReader
+
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="") as spool:
+        reader = PdfReader(pdf_path)
+        page_count = len(reader.pages)
+
+        for number, text in _iter_numbered_pages(reader):
+            spool.write(text)
+            page_numbers.append(number)
+            page_lengths.append(len(text))
+            window = tail + text
+            present.update(s for s in SEPARATORS if s in window)
+            tail = text[-1:]
+            first_page = first_page or text
+            doc_countries.update(count_countries(text))
+            doc_years.update(count_years(text))
+
+        document = {
+            "publisher": detect_publisher(os.path.basename(pdf_path), first_page),
+            "country": most_common(doc_countries),
+            "year": most_common(count_years(first_page), most_common(doc_years)),
+        }
+
+        if not page_lengths:
+            open(chunks_path, "w").close()
+            return 0, page_count, document
+
+        separator = next((s for s in SEPARATORS if s in present), SEPARATORS[-1])
+        locator = _ChunkLocator(page_numbers, page_lengths)
+
+        def _pages():
+            spool.seek(0)
+            for length in page_lengths:
+                text = spool.read(length)
+                locator.feed(text)
+                yield text
+
+        count = 0
+        with open(chunks_path, "w", encoding="utf-8") as out:
+            for chunk in iter_chunks(_pages(), separator):
+                page_start, page_end = locator.locate(chunk)
+                record = {
+                    "text": chunk,
+                    "page_start": page_start,
+                    "page_end": page_end,
+                    "country": most_common(count_countries(chunk), document["country"]),
+                    "year": most_common(count_years(chunk), document["year"]),
+                }
+                out.write(json.dumps(record) + "\n")
+                count += 1
+
+    return count, page_count, document
+
+
+def read_chunks(chunks_path: str):
+    """
+    Lazily read chunks back from a spool file written by spool_pdf_chunks.
+    """
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def extract_and_chunk(pdf_path: str):
+    """
+    Worker entry point: chunk one PDF into a temp spool file.
+    Returns (spool path, chunk count, page count, document metadata);
+    the caller deletes the file.
+    """
+    fd, chunks_path = tempfile.mkstemp(suffix=".jsonl", prefix="chunks_")
+    os.close(fd)
+
+    try:
+        count, page_count, document = spool_pdf_chunks(pdf_path, chunks_path)
+    except Exception:
+        os.remove(chunks_path)
+        raise
+
+    return chunks_path, count, page_count, document
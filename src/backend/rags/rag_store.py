@@ -1,92 +1,693 @@
 # src/backend/rags/rag_store.py
 
+import copy
+import hashlib
+import json
+import multiprocessing
 import os
-import chromadb
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from pypdf import PdfReader
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from src.backend.config import (
+    EMBEDDING_PROVIDER,
+    RAG_INGEST_WORKERS,
+    RAG_INGEST_BATCH_SIZE,
+    RAG_QUERY_CACHE_SIZE,
+    RAG_SEARCH_MODE,
+    RAG_HYBRID_CANDIDATES,
+    RAG_RRF_K,
+    RAG_MMR_ENABLED,
+    RAG_MMR_LAMBDA,
+    RAG_MMR_CANDIDATES,
+    RAG_DUPLICATE_THRESHOLD,
+)
+from src.backend.rags.bm25_index import BM25Index, reciprocal_rank_fusion
+from src.backend.rags.rerank import mmr_select
+from src.backend.rags.pdf_extract import extract_and_chunk, read_chunks
+from src.backend.tools import metrics
+from src.backend.tools.lru_cache import LRUCache
+
+
+
+def collection_name(base: str = "economic_reports") -> str:
+    """
+    One collection per provider, since vectors from different models don't mix.
+    The local provider keeps the original collection.
+    """
+    return base if EMBEDDING_PROVIDER == "local" else f"{base}_{EMBEDDING_PROVIDER}"
+
 
 CHROMA_DIR = "chroma_store"
+COLLECTION_NAME = collection_name("economic_reports")
 
-# Initialize vector DB and embeddings
-embeddings = OpenAIEmbeddings()
-client = chromadb.PersistentClient(path=CHROMA_DIR)
+# Content hashes of ingested files and chunks, used to skip unchanged PDFs
+MANIFEST_PATH = os.path.join(CHROMA_DIR, f"{COLLECTION_NAME}_manifest.json")
 
-collection = client.get_or_create_collection(
-    name="economic_reports",
-    metadata={"hnsw:space": "cosine"}
-)
+# Bump when chunking or chunk metadata changes to force a full re-ingest
+# (2: page range, publisher, country and year metadata per chunk)
+PIPELINE_VERSION = 2
+
+# Lexical (BM25) index over the same chunks, rebuilt whenever ingest changes them
+BM25_PATH = os.path.join(CHROMA_DIR, f"{COLLECTION_NAME}_bm25.npz")
+BM25_PAGE_SIZE = 5000
+
+SEARCH_MODES = ("vector", "hybrid")
 
+# Vector DB and embeddings are opened on first use (see get_collection):
+# importing this module doesn't load chromadb or the embedding model
+_client = None
+_collection = None
+_collection_lock = threading.Lock()
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+# Query-side caches. Result keys include the collection version, which
+# ingest_pdfs bumps whenever it changes the collection.
+collection_version = 0
+query_embedding_cache = LRUCache(RAG_QUERY_CACHE_SIZE)
+query_result_cache = LRUCache(RAG_QUERY_CACHE_SIZE)
+metrics.register_cache("rag_query_embeddings", query_embedding_cache.stats)
+metrics.register_cache("rag_query_results", query_result_cache.stats)
+
+# Loaded lazily from BM25_PATH on the first hybrid search
+bm25_index = None
+
+
+def get_collection():
     """
-    Extract all text from a PDF using pypdf.
+    The report collection, opened once per process on first use.
     """
-    reader = PdfReader(pdf_path)
-    full_text = ""
+    global _client, _collection
 
-    for page in reader.pages:
-        content = page.extract_text()
-        if content:
-            full_text += content + "\n"
+    with _collection_lock:
+        if _collection is None:
+            import chromadb
 
-    return full_text
+            _client = chromadb.PersistentClient(path=CHROMA_DIR)
+            _migrate_collection(_client)
+            _collection = _client.get_or_create_collection(
+                name=COLLECTION_NAME,
+                metadata={"hnsw:space": "cosine"},
+                embedding_function=_embedding_function(),
+            )
 
+    return _collection
 
-def chunk_text(text: str) -> list:
+
+def _migrate_collection(client, page_size: int = 1000):
     """
-    Split long text into smaller chunks for embedding.
+    Collections built before the embedding function had its own name were
+    persisted under Chroma's "default" one, and Chroma refuses to reopen them
+    with a differently named function. Their vectors come from the same
+    all-MiniLM-L6-v2 model, so copy them as they are into a collection
+    recorded under the new name instead of re-embedding every chunk.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=800,
-        chunk_overlap=150,
-        separators=["\n\n", "\n", ".", " "]
+    from chromadb.errors import NotFoundError
+
+    function = _embedding_function()
+    if function.backend.provider != "local":
+        return
+
+    try:
+        old = client.get_collection(COLLECTION_NAME)
+    except NotFoundError:
+        return
+    persisted = old.configuration.get("embedding_function")
+    if persisted is None or persisted.name() != "default":
+        return
+
+    # Copy into a side collection first: a crash part-way leaves the old one intact
+    staging_name = f"{COLLECTION_NAME}_migrating"
+    try:
+        client.delete_collection(staging_name)
+    except NotFoundError:
+        pass
+    staging = client.create_collection(
+        name=staging_name,
+        metadata={"hnsw:space": "cosine"},
+        embedding_function=function,
     )
 
-    chunks = splitter.split_text(text)
-    return chunks
+    total = old.count()
+    for offset in range(0, total, page_size):
+        page = old.get(limit=page_size, offset=offset, include=["embeddings", "documents", "metadatas"])
+        staging.add(
+            ids=page["ids"],
+            embeddings=page["embeddings"],
+            documents=page["documents"],
+            metadatas=page["metadatas"],
+        )
+
+    client.delete_collection(COLLECTION_NAME)
+    staging.modify(name=COLLECTION_NAME)
+    print(f"[rag] Moved {total} chunks of '{COLLECTION_NAME}' to the {function.name()} embedding function")
+
+
+def _embedding_function():
+    from src.backend.rags.embeddings import get_embedding_function
+
+    return get_embedding_function()
+
+
+def warm_up():
+    """
+    Open the collection and load the embedding model ahead of the first search.
+    """
+    get_collection()
+    _embedding_function().backend.warm_up()
+
+
+def _sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    """
+    Per-file record of what is currently in the collection:
+    {"version", "files": {"ecb.pdf": {"sha256", "size", "mtime", "chunks": [chunk hashes]}}}
+
+    A manifest from an older PIPELINE_VERSION keeps only its chunk counts, so
+    every file is reprocessed and leftover chunk IDs can still be deleted.
+    """
+    if not os.path.exists(MANIFEST_PATH):
+        return {"version": PIPELINE_VERSION, "files": {}}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != PIPELINE_VERSION:
+        for entry in manifest["files"].values():
+            entry.update(sha256=None, size=None, mtime=None, chunks=[None] * len(entry["chunks"]))
+        manifest["version"] = PIPELINE_VERSION
+
+    return manifest
+
+
+def save_manifest(manifest: dict):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, MANIFEST_PATH)
 
 
-def ingest_pdfs(folder_path="data/reports_pdfs"):
+def corpus_version() -> str:
     """
-    Ingest all PDF files into the Chroma vector store.
+    Content hash of every ingested file (plus the pipeline version). Unlike
+    collection_version it is stable across restarts, so it can key artifacts.
+    """
+    digest = hashlib.sha256(f"pipeline:{PIPELINE_VERSION}".encode("utf-8"))
+    for file, entry in sorted(load_manifest()["files"].items()):
+        digest.update(f"|{file}:{entry['sha256']}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _chunk_ids(base_id: str, start: int, stop: int) -> list:
+    return [f"{base_id}_chunk_{i}" for i in range(start, stop)]
+
+
+def _chunk_metadata(file: str, document: dict, record: dict) -> dict:
+    """
+    Chroma metadata for one chunk; undetected fields are left out.
+    """
+    metadata = {
+        "source": file,
+        "publisher": document["publisher"],
+        "page_start": record["page_start"],
+        "page_end": record["page_end"],
+        "country": record["country"],
+        "year": record["year"],
+    }
+    return {k: v for k, v in metadata.items() if v is not None}
+
+
+def _flush(pending: dict):
+    """
+    Write one batch of chunks (embedding happens inside upsert).
+    """
+    if pending["ids"]:
+        get_collection().upsert(documents=pending["documents"], metadatas=pending["metadatas"], ids=pending["ids"])
+        pending["ids"], pending["documents"], pending["metadatas"] = [], [], []
+
+
+def _extract_in_pool(jobs: list, workers: int):
+    """
+    Yield (file, chunk spool path, chunk count, page count, document metadata) as worker
+    processes finish, keeping at most 2 * workers files in flight.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for file, pdf_path in jobs:
+            yield (file, *extract_and_chunk(pdf_path))
+        return
+
+    # Spawned, not forked: this runs inside the server process, whose other
+    # threads (HTTP client loop, worker pool) and held locks must not be
+    # copied into the children. extract_and_chunk is a module-level
+    # function, so the fresh interpreters can import it.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        queue = iter(jobs)
+        in_flight = {}
+
+        def _submit_next():
+            for file, pdf_path in queue:
+                in_flight[pool.submit(extract_and_chunk, pdf_path)] = file
+                return
+
+        for _ in range(2 * workers):
+            _submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file = in_flight.pop(future)
+                _submit_next()
+                yield (file, *future.result())
+
+
+def ingest_pdfs(folder_path="data/reports_pdfs", workers: int = None, batch_size: int = None):
+    """
+    Incrementally sync PDF files into the Chroma vector store.
     Each chunk becomes a separate document with unique ID.
+
+    - unchanged files (same size/mtime or same content hash) are skipped
+    - new or changed files are extracted and chunked in a process pool
+      (RAG_INGEST_WORKERS); only chunks whose content hash changed are
+      upserted, in batches of RAG_INGEST_BATCH_SIZE, and trailing chunks
+      that no longer exist are deleted
+    - chunks of files removed from the folder are deleted
+    - every chunk carries source, publisher, page range and detected
+      country/year metadata for filtered search
     """
+    workers = workers or RAG_INGEST_WORKERS
+    batch_size = batch_size or RAG_INGEST_BATCH_SIZE
+    started = time.perf_counter()
 
-    all_chunks = []
-    all_ids = []
+    manifest = load_manifest()
+    known = manifest["files"]
 
-    for file in os.listdir(folder_path):
-        if file.lower().endswith(".pdf"):
+    pdf_files = sorted(f for f in os.listdir(folder_path) if f.lower().endswith(".pdf"))
 
-            pdf_path = os.path.join(folder_path, file)
-            base_id = os.path.splitext(file)[0]
+    stats = {
+        "files_processed": 0,
+        "files_skipped": 0,
+        "files_removed": 0,
+        "pages_extracted": 0,
+        "chunks_ingested": 0,
+        "chunks_unchanged": 0,
+        "chunks_deleted": 0,
+    }
 
-            print(f"Extracting PDF: {file}")
+    # ---- REMOVED FILES ----
+    for file in sorted(set(known) - set(pdf_files)):
+        base_id = os.path.splitext(file)[0]
+        stale_ids = _chunk_ids(base_id, 0, len(known[file]["chunks"]))
+        if stale_ids:
+            get_collection().delete(ids=stale_ids)
+        stats["chunks_deleted"] += len(stale_ids)
+        stats["files_removed"] += 1
+        del known[file]
 
-            text = extract_text_from_pdf(pdf_path)
-            chunks = chunk_text(text)
+    # ---- FIND NEW / CHANGED FILES ----
+    jobs = []
+    fingerprints = {}
 
-            # Add chunks with unique IDs
-            for i, chunk in enumerate(chunks):
-                all_chunks.append(chunk)
-                all_ids.append(f"{base_id}_chunk_{i}")
+    for file in pdf_files:
+        pdf_path = os.path.join(folder_path, file)
+        stat = os.stat(pdf_path)
+        entry = known.get(file)
 
-    if all_chunks:
-        print(f"Ingesting {len(all_chunks)} chunks...")
-        collection.add(documents=all_chunks, ids=all_ids)
-        return {"status": "ok", "chunks_ingested": len(all_chunks)}
-    else:
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            stats["files_skipped"] += 1
+            continue
+
+        file_hash = _sha256_file(pdf_path)
+        if entry and entry["sha256"] == file_hash:
+            entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+            stats["files_skipped"] += 1
+            continue
+
+        fingerprints[file] = {"sha256": file_hash, "size": stat.st_size, "mtime": stat.st_mtime}
+        jobs.append((file, pdf_path))
+
+    # ---- EXTRACT (parallel) + WRITE (batched) ----
+    pending = {"ids": [], "documents": [], "metadatas": []}
+
+    for file, chunks_path, chunk_count, page_count, document in _extract_in_pool(jobs, workers):
+        base_id = os.path.splitext(file)[0]
+        old_hashes = known[file]["chunks"] if file in known else []
+        chunk_hashes = []
+        changed = 0
+
+        # Chunks are streamed from the worker's spool file, never held all at once
+        try:
+            for i, record in enumerate(read_chunks(chunks_path)):
+                metadata = _chunk_metadata(file, document, record)
+                # Hash text and metadata together so metadata-only changes are rewritten
+                chunk_hash = _sha256_text(json.dumps([record["text"], metadata], sort_keys=True))
+                chunk_hashes.append(chunk_hash)
+
+                if i < len(old_hashes) and old_hashes[i] == chunk_hash:
+                    continue
+
+                changed += 1
+                pending["ids"].append(f"{base_id}_chunk_{i}")
+                pending["documents"].append(record["text"])
+                pending["metadatas"].append(metadata)
+                if len(pending["ids"]) >= batch_size:
+                    _flush(pending)
+        finally:
+            os.remove(chunks_path)
+
+        stale_ids = _chunk_ids(base_id, chunk_count, len(old_hashes))
+        if stale_ids:
+            get_collection().delete(ids=stale_ids)
+
+        known[file] = {**fingerprints[file], "chunks": chunk_hashes}
+
+        stats["files_processed"] += 1
+        stats["pages_extracted"] += page_count
+        stats["chunks_ingested"] += changed
+        stats["chunks_unchanged"] += chunk_count - changed
+        stats["chunks_deleted"] += len(stale_ids)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"[{stats['files_processed']}/{len(jobs)}] {file}: {page_count} pages, "
+            f"{changed}/{chunk_count} chunks changed "
+            f"({stats['pages_extracted'] / elapsed:.1f} pages/s)"
+        )
+
+    _flush(pending)
+    save_manifest(manifest)
+
+    if stats["chunks_ingested"] or stats["chunks_deleted"] or not os.path.exists(BM25_PATH):
+        stats["bm25_terms"] = build_bm25_index()
+        _bump_collection_version()
+
+    if not pdf_files and not stats["files_removed"]:
         return {"status": "no_pdfs_found"}
 
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["pages_per_second"] = round(stats["pages_extracted"] / elapsed, 2) if elapsed else 0.0
+    stats["chunks_per_second"] = round(stats["chunks_ingested"] / elapsed, 2) if elapsed else 0.0
+
+    if stats["chunks_ingested"]:
+        print(
+            f"Ingested {stats['chunks_ingested']} chunks in {elapsed:.1f}s "
+            f"({stats['pages_per_second']} pages/s, {stats['chunks_per_second']} chunks/s)"
+        )
+
+    stats["embedding_cache"] = _embedding_function().cache.stats()
+
+    return {"status": "ok", **stats}
+
 
-def search_reports(query: str, n=3):
+def build_bm25_index() -> int:
     """
-    Query the economic reports vector store.
+    Rebuild the BM25 index from every chunk in the collection and persist it.
+    Returns the vocabulary size.
     """
-    results = collection.query(
-        query_texts=[query],
-        n_results=n
+    global bm25_index
+
+    ids, documents = [], []
+    offset = 0
+    while True:
+        page = get_collection().get(include=["documents"], limit=BM25_PAGE_SIZE, offset=offset)
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        if len(page["ids"]) < BM25_PAGE_SIZE:
+            break
+        offset += BM25_PAGE_SIZE
+
+    bm25_index = BM25Index.build(ids, documents)
+    bm25_index.save(BM25_PATH)
+    return len(bm25_index.terms)
+
+
+def _get_bm25_index() -> BM25Index:
+    global bm25_index
+    if bm25_index is None:
+        if os.path.exists(BM25_PATH):
+            bm25_index = BM25Index.load(BM25_PATH)
+        else:
+            build_bm25_index()
+    return bm25_index
+
+
+def _bump_collection_version():
+    global collection_version
+    collection_version += 1
+    query_result_cache.clear()
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _query_embedding(query: str):
+    """
+    Embedding of the query as written, cached under its normalized form.
+    """
+    return _query_embeddings([query])[0]
+
+
+def _query_embeddings(queries: list) -> list:
+    """
+    Embeddings for many queries; cache misses go to the model in one batch.
+    The model sees the original text (case and spacing carry meaning for it),
+    the normalized text is only the cache key.
+    """
+    found = {}
+    missing = {}
+    for query in queries:
+        key = _normalize_query(query)
+        if key in found or key in missing:
+            continue
+        embedding = query_embedding_cache.get(key)
+        if embedding is not None:
+            found[key] = embedding
+        else:
+            missing[key] = query
+
+    if missing:
+        for key, embedding in zip(missing, _embedding_function().embed_query(list(missing.values()))):
+            found[key] = embedding
+            query_embedding_cache.set(key, embedding)
+
+    return [found[_normalize_query(query)] for query in queries]
+
+
+def build_where(country: str = None, publisher: str = None, year: int = None, source: str = None):
+    """
+    Chroma where filter from simple equality fields (None when nothing is set).
+    """
+    clauses = [
+        {field: value}
+        for field, value in (
+            ("country", country.upper() if country else None),
+            ("publisher", publisher),
+            ("year", year),
+            ("source", source),
+        )
+        if value is not None
+    ]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _hybrid_search(normalized: str, embedding, n: int, where: dict = None, with_embeddings: bool = False) -> dict:
+    """
+    Fuse the vector and BM25 candidate lists with reciprocal rank fusion and
+    return the top n in Chroma's query result shape, with RRF "scores".
+    """
+    candidates = max(n, RAG_HYBRID_CANDIDATES)
+    result = _hybrid_batch([normalized], [embedding], candidates, where, with_embeddings)[0]
+    return {field: [rows[0][:n]] for field, rows in result.items()}
+
+
+def _rerank(results: dict, query_embedding, n: int) -> dict:
+    """
+    Keep the MMR selection of n candidates (in MMR order) from a single-query
+    result that includes embeddings. The embeddings are dropped from the output.
+    """
+    candidates = results.pop("embeddings")[0]
+
+    # Hybrid results keep their fused ranking as the relevance term
+    relevance = None
+    if results.get("scores") and results["scores"][0]:
+        scores = np.asarray(results["scores"][0], dtype=np.float32)
+        relevance = scores / scores.max()
+
+    picked = mmr_select(
+        query_embedding,
+        candidates if candidates is not None else [],
+        n,
+        lambda_mult=RAG_MMR_LAMBDA,
+        duplicate_threshold=RAG_DUPLICATE_THRESHOLD,
+        relevance=relevance,
     )
 
+    for field, rows in results.items():
+        if field != "included" and rows is not None:
+            results[field] = [[rows[0][i] for i in picked]]
+    if "included" in results:
+        results["included"] = [field for field in results["included"] if field != "embeddings"]
     return results
+
+
+def search_reports(query: str, n=3, mode: str = None, where: dict = None, mmr: bool = None):
+    """
+    Query the economic reports store.
+
+    mode="vector" (default RAG_SEARCH_MODE) is plain embedding search;
+    mode="hybrid" fuses it with BM25 keyword search, which helps on exact
+    terms, codes and figures the embedding model blurs.
+    where is a Chroma metadata filter (see build_where), e.g. {"country": "DE"}.
+    With mmr (default RAG_MMR_ENABLED), RAG_MMR_CANDIDATES are fetched and
+    re-ranked with Maximal Marginal Relevance on their stored embeddings, so
+    overlapping neighbours don't crowd out distinct passages.
+    Query embeddings and top-k results are memoized per normalized query.
+    """
+    mode = (mode or RAG_SEARCH_MODE).lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mmr is None:
+        mmr = RAG_MMR_ENABLED
+
+    normalized = _normalize_query(query)
+    key = (collection_version, normalized, n, mode, json.dumps(where, sort_keys=True), mmr)
+
+    cached = query_result_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    fetch = max(n, RAG_MMR_CANDIDATES) if mmr else n
+    embedding = _query_embedding(query)
+
+    if mode == "hybrid":
+        results = _hybrid_search(normalized, embedding, fetch, where, with_embeddings=mmr)
+    elif mmr:
+        results = get_collection().query(
+            query_embeddings=[embedding],
+            n_results=fetch,
+            where=where,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+    else:
+        results = get_collection().query(
+            query_embeddings=[embedding],
+            n_results=n,
+            where=where,
+        )
+
+    if mmr:
+        results = _rerank(results, embedding, n)
+
+    query_result_cache.set(key, copy.deepcopy(results))
+    return results
+
+
+def search_reports_batch(queries: list, n=3, mode: str = None, where: dict = None, mmr: bool = None) -> list:
+    """
+    Answer many queries at once: one embedding batch for the uncached queries
+    and one Chroma ANN call for all of them. n is an int or one int per query.
+    Returns one result per query in search_reports' shape.
+    """
+    mode = (mode or RAG_SEARCH_MODE).lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mmr is None:
+        mmr = RAG_MMR_ENABLED
+
+    counts = list(n) if isinstance(n, (list, tuple)) else [n] * len(queries)
+    if len(counts) != len(queries):
+        raise ValueError("n must be an int or one value per query")
+    if not queries:
+        return []
+
+    normalized = [_normalize_query(q) for q in queries]
+    embeddings = _query_embeddings(queries)
+
+    fetch = max(counts)
+    if mmr:
+        fetch = max(fetch, RAG_MMR_CANDIDATES)
+    if mode == "hybrid":
+        fetch = max(fetch, RAG_HYBRID_CANDIDATES)
+
+    if mode == "vector":
+        include = ["documents", "metadatas", "distances"] + (["embeddings"] if mmr else [])
+        batch = get_collection().query(query_embeddings=embeddings, n_results=fetch, where=where, include=include)
+        results = [
+            {field: [batch[field][i][:fetch if mmr else k]] for field in include + ["ids"]}
+            for i, k in enumerate(counts)
+        ]
+    else:
+        results = _hybrid_batch(normalized, embeddings, fetch, where, mmr)
+        if not mmr:
+            results = [{field: [rows[0][:k]] for field, rows in r.items()} for r, k in zip(results, counts)]
+
+    if mmr:
+        results = [_rerank(r, embedding, k) for r, embedding, k in zip(results, embeddings, counts)]
+    return results
+
+
+def _hybrid_batch(normalized: list, embeddings: list, candidates: int, where: dict, with_embeddings: bool) -> list:
+    """
+    Hybrid search for many queries: one ANN call, per-query BM25 + RRF,
+    then one collection.get for every fused chunk.
+    """
+    vector_hits = get_collection().query(query_embeddings=embeddings, n_results=candidates, where=where, include=[])["ids"]
+    index = _get_bm25_index()
+
+    fused_lists = []
+    for query, hits in zip(normalized, vector_hits):
+        ranked = [doc_id for doc_id, _ in index.search(query, candidates * (5 if where else 1))]
+        fused_lists.append((hits, ranked))
+
+    if where:
+        # Filter every query's BM25 candidates through one metadata lookup
+        pool = list(dict.fromkeys(doc_id for _, ranked in fused_lists for doc_id in ranked))
+        allowed = set(get_collection().get(ids=pool, where=where, include=[])["ids"]) if pool else set()
+    fused_lists = [
+        reciprocal_rank_fusion(
+            [hits, [d for d in ranked if not where or d in allowed][:candidates]], k=RAG_RRF_K
+        )[:candidates]
+        for hits, ranked in fused_lists
+    ]
+
+    ids = list(dict.fromkeys(doc_id for fused in fused_lists for doc_id, _ in fused))
+    include = ["documents", "metadatas"] + (["embeddings"] if with_embeddings else [])
+    found = get_collection().get(ids=ids, include=include) if ids else {"ids": [], **{f: [] for f in include}}
+    position = {doc_id: i for i, doc_id in enumerate(found["ids"])}
+
+    results = []
+    for fused in fused_lists:
+        fused = [(doc_id, score) for doc_id, score in fused if doc_id in position]
+        result = {
+            "ids": [[doc_id for doc_id, _ in fused]],
+            "scores": [[round(score, 6) for _, score in fused]],
+        }
+        for field in include:
+            result[field] = [[found[field][position[doc_id]] for doc_id, _ in fused]]
+        results.append(result)
+    return results
+
+
+def query_cache_stats() -> dict:
+    """
+    Hit ratios of the query embedding and result caches.
+    """
+    return {
+        "collection_version": collection_version,
+        "embeddings": query_embedding_cache.stats(),
+        "results": query_result_cache.stats(),
+    }
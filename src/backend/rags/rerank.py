@@ -0,0 +1,118 @@
+# src/backend/rags/rerank.py
+
+import re
+import numpy as np
+
+CHUNK_ID_RE = re.compile(r"^(?P<base>.+)_chunk_(?P<index>\d+)$")
+
+# Shortest suffix/prefix match treated as real chunk overlap when merging
+MIN_OVERLAP = 20
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    query_vector,
+    doc_vectors,
+    k: int,
+    lambda_mult: float = 0.7,
+    duplicate_threshold: float = 1.0,
+    relevance=None,
+) -> list:
+    """
+    Greedy Maximal Marginal Relevance on cosine similarity.
+
+    Each step picks the candidate maximising
+        lambda * relevance(doc) - (1 - lambda) * max sim(doc, already selected)
+    where relevance defaults to sim(query, doc); pass it explicitly (scaled to
+    [0, 1]) to keep another ranker's ordering, e.g. fused hybrid scores.
+    Candidates at least duplicate_threshold similar to a selected one are
+    dropped, so fewer than k indices may come back.
+    """
+    docs = _normalize_rows(np.asarray(doc_vectors, dtype=np.float32))
+    if not len(docs) or k <= 0:
+        return []
+
+    if relevance is None:
+        query = _normalize_rows(np.asarray(query_vector, dtype=np.float32))
+        relevance = docs @ query
+    else:
+        relevance = np.asarray(relevance, dtype=np.float32)
+    similarity = docs @ docs.T
+
+    available = np.ones(len(docs), dtype=bool)
+    max_similarity = np.full(len(docs), -np.inf, dtype=np.float32)
+    selected = []
+
+    while len(selected) < k and available.any():
+        if selected:
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+
+        max_similarity = np.maximum(max_similarity, similarity[best])
+        available &= max_similarity < duplicate_threshold
+
+    return selected
+
+
+def _overlap(left: str, right: str) -> int:
+    """
+    Length of the longest suffix of left that is also a prefix of right.
+    """
+    for length in range(min(len(left), len(right)), MIN_OVERLAP - 1, -1):
+        if left.endswith(right[:length]):
+            return length
+    return 0
+
+
+def merge_text(left: str, right: str) -> str:
+    overlap = _overlap(left, right)
+    if overlap:
+        return left + right[overlap:]
+    return left + " " + right
+
+
+def merge_adjacent(ids: list, documents: list) -> list:
+    """
+    Collapse runs of neighbouring chunks of the same file (…_chunk_4,
+    …_chunk_5) into one passage with the overlap removed. Passages are
+    ordered by the rank of their best-ranked chunk.
+    """
+    runs_by_file = {}
+    passages = []  # (rank, text)
+
+    for rank, (doc_id, text) in enumerate(zip(ids, documents)):
+        match = CHUNK_ID_RE.match(doc_id)
+        if match:
+            runs_by_file.setdefault(match["base"], []).append((int(match["index"]), rank, text))
+        else:
+            passages.append((rank, text))
+
+    for chunks in runs_by_file.values():
+        chunks.sort()
+        run = [chunks[0]]
+        for chunk in chunks[1:]:
+            if chunk[0] == run[-1][0] + 1:
+                run.append(chunk)
+                continue
+            passages.append(_merge_run(run))
+            run = [chunk]
+        passages.append(_merge_run(run))
+
+    return [text for _, text in sorted(passages, key=lambda p: p[0])]
+
+
+def _merge_run(run: list):
+    text = run[0][2]
+    for _, _, right in run[1:]:
+        text = merge_text(text, right)
+    return min(rank for _, rank, _ in run), text
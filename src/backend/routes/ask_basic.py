@@ -1,20 +1,18 @@
 # src/backend/routes/ask_basic.py
 
 from fastapi import APIRouter
-from src.backend.config import OPENAI_API_KEY, MODEL
-from openai import OpenAI
+from src.backend.config import MODEL
+from src.backend.tools.llm_client import chat_completion
 
 router = APIRouter()
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 @router.get("/ask-basic")
-def ask_basic(query: str):
+async def ask_basic(query: str):
     """
     Simple LLM test endpoint.
     Sends the user's query to the model and returns the response.
     """
-    response = client.chat.completions.create(
+    response = await chat_completion(
         model=MODEL,
         messages=[{"role": "user", "content": query}],
     )
@@ -1,16 +1,28 @@
 # src/backend/routes/ask_economic.py
 
 from fastapi import APIRouter
-from src.agent.economic_agent import analyze_economy
+from src.agent.economic_agent import analyze_economy, stream_economy
+from src.backend.tools.sse import sse_response
 
 router = APIRouter()
 
 @router.get("/ask-economic")
-def ask_economic(query: str, country: str = None):
+async def ask_economic(query: str, country: str = None, timings: bool = False, fused: bool = None):
     """
     Main economic question endpoint.
     Attempts to detect country from query if not provided.
+    Pass timings=true to get a per-stage latency breakdown and
+    fused=true/false to override the single-call summarization mode.
     """
-    result = analyze_economy(query, country)
+    result = await analyze_economy(query, country, with_timings=timings, fused=fused)
     return result
 
+
+@router.get("/ask-economic/stream")
+async def ask_economic_stream(query: str, country: str = None):
+    """
+    Streaming variant of /ask-economic (Server-Sent Events).
+    Sends pipeline progress events first, then the final analysis
+    token by token, then a "done" event with the full result.
+    """
+    return sse_response(stream_economy(query, country))
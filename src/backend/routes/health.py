@@ -5,5 +5,5 @@ from fastapi import APIRouter
 router = APIRouter()
 
 @router.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
@@ -1,20 +1,49 @@
 # src/backend/routes/macro_basic.py
 
 from fastapi import APIRouter
-from src.backend.tools.macro_fetcher import get_indicator
+from src.backend.tools.macro_fetcher import aget_indicator, cache_stats
+from src.backend.tools import llm_cache
+from src.backend.tools.series import SERIES_FORMATS
 
 router = APIRouter()
 
 @router.get("/macro/basic")
-def macro_basic(country: str, indicator: str):
+async def macro_basic(
+    country: str,
+    indicator: str,
+    date: str = None,
+    mrv: int = None,
+    per_page: int = None,
+    format: str = "columns",
+):
     """
-    Basic macroeconomic data fetcher.
+    Basic macroeconomic data fetcher. Returns the full history unless
+    `date` (a year or "2000:2024") or `mrv` (N most recent years) narrow it;
+    `per_page` sets the upstream page size.
+    Data is columnar, latest year first: {"dates": [2024, ...], "values": [null, 2.4, ...]}
+    (monthly or quarterly series keep labels such as "2020M01" as their dates);
+    format=records gives the older [{"date": "2024", "value": null}, ...] rows.
     Example:
         /macro/basic?country=US&indicator=NY.GDP.MKTP.KD.ZG
+        /macro/basic?country=US&indicator=NY.GDP.MKTP.KD.ZG&date=2000:2024&format=records
     """
-    data = get_indicator(country, indicator)
+    if format not in SERIES_FORMATS:
+        return {"error": f"format must be one of: {', '.join(SERIES_FORMATS)}"}
+
+    data = await aget_indicator(country, indicator, date=date, mrv=mrv, per_page=per_page)
     return {
         "country": country.upper(),
         "indicator": indicator,
-        "data": data,
+        "data": data if isinstance(data, dict) else data.to_json(format),
+    }
+
+
+@router.get("/macro/cache_stats")
+def macro_cache_stats():
+    """
+    Hit/miss counters for the local World Bank series and LLM completion caches.
+    """
+    return {
+        "series": cache_stats(),
+        "llm": llm_cache.cache_stats(),
     }
@@ -0,0 +1,27 @@
+# src/backend/routes/macro_batch.py
+
+from fastapi import APIRouter
+from src.backend.tools.macro_fetcher import aget_latest_values
+
+router = APIRouter()
+
+@router.get("/macro/batch")
+async def macro_batch(countries: str = "US,DE,FR,GB", indicator: str = "NY.GDP.MKTP.KD.ZG"):
+    """
+    Latest value of one indicator for many countries in a single upstream call.
+    Example:
+        /macro/batch?countries=US,DE,FR&indicator=FP.CPI.TOTL.ZG
+        /macro/batch?countries=all&indicator=FP.CPI.TOTL.ZG
+    "all" anywhere in the list means every economy.
+    """
+    country_list = [c.strip() for c in countries.split(",") if c.strip()]
+
+    data = await aget_latest_values(country_list, indicator)
+
+    if isinstance(data, dict) and "error" in data:
+        return data
+
+    return {
+        "indicator": indicator,
+        "values": data  # [{"country":"US","iso3":"USA","date":"2023","value":2.5}, ...]
+    }
@@ -1,28 +1,46 @@
 # src/backend/routes/macro_live.py
 
 from fastapi import APIRouter
-from src.backend.tools.macro_fetcher import get_indicator
+from src.backend.tools.macro_fetcher import aget_indicator
+from src.backend.tools.series import SERIES_FORMATS
 
 router = APIRouter()
 
 @router.get("/macro/live_chart")
-def macro_live_chart(country: str = "US", indicator: str = "NY.GDP.MKTP.KD.ZG"):
+async def macro_live_chart(
+    country: str = "US",
+    indicator: str = "NY.GDP.MKTP.KD.ZG",
+    date: str = None,
+    mrv: int = None,
+    per_page: int = None,
+    format: str = "columns",
+):
     """
-    Returns cleaned macro data for charting.
+    Returns cleaned macro data for charting. `date` ("2000:2024") or `mrv`
+    (N most recent years) limit the fetch to the window being charted.
+    Columnar by default ("dates" / "values" arrays, latest first; years, or
+    "2020M01" style labels for sub-annual series);
+    format=records returns the older "values": [{"date", "value"}, ...] rows.
     """
-    data = get_indicator(country, indicator)
+    if format not in SERIES_FORMATS:
+        return {"error": f"format must be one of: {', '.join(SERIES_FORMATS)}"}
+
+    data = await aget_indicator(country, indicator, date=date, mrv=mrv, per_page=per_page)
 
     if isinstance(data, dict) and "error" in data:
         return data
 
-    # Convert values into chart-friendly format
-    cleaned = []
-    for row in data:
-        if row["value"] is not None:
-            cleaned.append(row)
+    # Periods without a value are dropped for charting
+    cleaned = data.dropna()
+    latest = data.latest()
 
-    return {
+    response = {
         "country": country,
         "indicator": indicator,
-        "values": cleaned  # [{"date":"2022","value":2.4}, ...]
+        "latest": {"date": latest[0], "value": latest[1]} if latest else None,
     }
+    if format == "records":
+        response["values"] = cleaned.to_records()  # [{"date":"2022","value":2.4}, ...]
+    else:
+        response.update(cleaned.to_columns())  # "dates": [2022, ...], "values": [2.4, ...]
+    return response
@@ -1,30 +1,21 @@
 # src/backend/routes/macro_summary.py
 
 from fastapi import APIRouter
-from src.backend.tools.macro_fetcher import get_indicator
-from src.backend.config import OPENAI_API_KEY, MODEL
-from openai import OpenAI
+from src.backend.tools.macro_fetcher import aget_indicator, series_tag
+from src.backend.tools.llm_cache import cached_completion, stream_completion
+from src.backend.tools.llm_client import get_client
+from src.backend.tools.sse import sse_response
+from src.backend.config import MODEL
 
 router = APIRouter()
-client = OpenAI(api_key=OPENAI_API_KEY)
 
-@router.get("/macro/summary")
-def macro_summary(country: str, indicator: str):
-    """
-    Fetches macroeconomic data, sends it to the LLM, and returns a human-readable summary.
-    """
-
-    data = get_indicator(country, indicator)
-
-    # If error from fetcher
-    if isinstance(data, dict) and "error" in data:
-        return data
 
+def _summary_prompt(country: str, indicator: str, data: list) -> str:
     # Prepare compact table-like summary to give LLM structure
     rows = [f"{row['date']}: {row['value']}" for row in data[:6]]  # limit to latest 6 rows
     formatted_data = "\n".join(rows)
 
-    prompt = f"""
+    return f"""
 You are an economic analyst.
 
 Given this macroeconomic data for country {country.upper()} and indicator '{indicator}', 
@@ -37,16 +28,68 @@ Data:
 Summary:
 """
 
-    response = client.chat.completions.create(
+
+@router.get("/macro/summary")
+async def macro_summary(country: str, indicator: str):
+    """
+    Fetches macroeconomic data, sends it to the LLM, and returns a human-readable summary.
+    """
+
+    data = await aget_indicator(country, indicator)
+
+    # If error from fetcher
+    if isinstance(data, dict) and "error" in data:
+        return data
+
+    recent = data[:6].to_records()
+
+    summary = await cached_completion(
+        get_client(),
         model=MODEL,
-        messages=[{"role": "user", "content": prompt}],
+        messages=[{"role": "user", "content": _summary_prompt(country, indicator, recent)}],
+        tag=series_tag(country, indicator),
     )
 
-    summary = response.choices[0].message.content
-
     return {
         "country": country.upper(),
         "indicator": indicator,
         "summary": summary,
-        "raw_data": data[:6]
+        "raw_data": recent
     }
+
+
+@router.get("/macro/summary/stream")
+async def macro_summary_stream(country: str, indicator: str):
+    """
+    Streaming variant of /macro/summary (Server-Sent Events):
+    a "data" event with the rows, "token" events with the summary text,
+    then a "done" event carrying the same payload as /macro/summary.
+    """
+    async def events():
+        data = await aget_indicator(country, indicator)
+
+        if isinstance(data, dict) and "error" in data:
+            yield "error", data
+            return
+
+        recent = data[:6].to_records()
+        yield "data", {"country": country.upper(), "indicator": indicator, "raw_data": recent}
+
+        parts = []
+        async for delta in stream_completion(
+            get_client(),
+            model=MODEL,
+            messages=[{"role": "user", "content": _summary_prompt(country, indicator, recent)}],
+            tag=series_tag(country, indicator),
+        ):
+            parts.append(delta)
+            yield "token", {"text": delta}
+
+        yield "done", {
+            "country": country.upper(),
+            "indicator": indicator,
+            "summary": "".join(parts),
+            "raw_data": recent
+        }
+
+    return sse_response(events())
@@ -0,0 +1,15 @@
+# src/backend/routes/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.backend.tools import metrics
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Request, stage and upstream latency histograms, upstream error, token
+    and cache counters in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,52 @@
+# src/backend/routes/profiles.py
+
+import json
+from fastapi import APIRouter, Header
+from fastapi.responses import FileResponse, JSONResponse
+from src.backend.tools import profiler
+
+router = APIRouter()
+
+
+def _forbidden() -> JSONResponse:
+    return JSONResponse({"error": "Admin token required (profiling is off unless PROFILING_ADMIN_TOKEN is set)"}, status_code=403)
+
+
+@router.get("/admin/profiles")
+def list_profiles(x_admin_token: str = Header(None)):
+    """
+    Stored request profiles, newest first. Profile a request by sending
+    X-Profile: 1 (or ?profile=1) with X-Admin-Token; its response carries X-Profile-Id.
+    """
+    if not profiler.is_admin(x_admin_token):
+        return _forbidden()
+    if profiler.UNSUPPORTED:
+        return {"error": f"Profiling is unavailable on this Python: {profiler.UNSUPPORTED}", "profiles": []}
+    return {"profiles": profiler.list_profiles()}
+
+
+@router.get("/admin/profiles/{profile_id}")
+def get_profile(profile_id: str, x_admin_token: str = Header(None)):
+    """
+    Wall vs CPU vs awaiting split, sample counts and top await sites.
+    """
+    if not profiler.is_admin(x_admin_token):
+        return _forbidden()
+    paths = profiler.profile_paths(profile_id)
+    if paths is None:
+        return {"error": "Unknown profile id"}
+    with open(paths[0], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@router.get("/admin/profiles/{profile_id}/folded")
+def download_profile(profile_id: str, x_admin_token: str = Header(None)):
+    """
+    Folded stacks ("frame;frame;frame count"), ready for flamegraph.pl or speedscope.
+    """
+    if not profiler.is_admin(x_admin_token):
+        return _forbidden()
+    paths = profiler.profile_paths(profile_id)
+    if paths is None:
+        return {"error": "Unknown profile id"}
+    return FileResponse(paths[1], media_type="text/plain", filename=f"profile_{profile_id}.folded")
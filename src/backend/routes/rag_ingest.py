@@ -6,8 +6,9 @@ from src.backend.rags.rag_store import ingest_pdfs
 router = APIRouter()
 
 @router.post("/rag/ingest")
-def rag_ingest():
+def rag_ingest(workers: int = None, batch_size: int = None):
     """
     Ingest all PDFs from the data/reports_pdfs directory.
+    workers / batch_size override the extraction pool size and write batch size.
     """
-    return ingest_pdfs()
+    return ingest_pdfs(workers=workers, batch_size=batch_size)
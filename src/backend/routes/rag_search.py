@@ -1,14 +1,120 @@
 # src/backend/routes/rag_search.py
 
+import json
 from fastapi import APIRouter
-from src.backend.rags.rag_store import search_reports
+from pydantic import BaseModel
+from src.backend.config import RAG_BATCH_MAX_QUERIES
+from src.backend.rags.rag_store import (
+    search_reports,
+    search_reports_batch,
+    query_cache_stats,
+    build_where,
+    SEARCH_MODES,
+)
 
 router = APIRouter()
 
+
+class BatchQuery(BaseModel):
+    query: str
+    n: int = 3
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[BatchQuery]
+    mode: str = None
+    mmr: bool = None
+    where: dict = None
+
+
 @router.get("/rag/search")
-def rag_search(query: str):
-    results = search_reports(query)
+def rag_search(
+    query: str,
+    n: int = 3,
+    mode: str = None,
+    country: str = None,
+    publisher: str = None,
+    year: int = None,
+    source: str = None,
+    where: str = None,
+    mmr: bool = None,
+):
+    """
+    mode: "vector" (embedding search) or "hybrid" (BM25 + vector, RRF-fused).
+    Defaults to RAG_SEARCH_MODE. mmr re-ranks an over-fetched candidate set
+    for diversity (default RAG_MMR_ENABLED).
+
+    Results can be scoped with country / publisher / year / source, or with
+    a raw Chroma filter as JSON, e.g. where={"page_start": {"$lte": 10}}.
+    """
+    if mode is not None and mode.lower() not in SEARCH_MODES:
+        return {"error": f"mode must be one of: {', '.join(SEARCH_MODES)}"}
+
+    clauses = []
+    if where:
+        try:
+            clauses.append(json.loads(where))
+        except json.JSONDecodeError:
+            return {"error": "where must be a JSON object"}
+    fields = build_where(country=country, publisher=publisher, year=year, source=source)
+    if fields:
+        clauses.append(fields)
+    where_filter = None if not clauses else clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    try:
+        results = search_reports(query, n=n, mode=mode, where=where_filter, mmr=mmr)
+    except ValueError as e:
+        # Chroma rejects malformed filters with ValueError
+        return {"error": f"Invalid filter: {e}"}
     return {
         "query": query,
         "results": results
     }
+
+
+@router.post("/rag/search/batch")
+def rag_search_batch(request: BatchSearchRequest):
+    """
+    Many retrieval probes in one round trip: one embedding batch and one
+    vector index call. The response is columnar: hits of query i are rows
+    offsets[i]:offsets[i + 1] of ids / documents / metadatas / distances
+    (or RRF scores in hybrid mode).
+    """
+    if len(request.queries) > RAG_BATCH_MAX_QUERIES:
+        return {"error": f"At most {RAG_BATCH_MAX_QUERIES} queries per batch"}
+    if request.mode is not None and request.mode.lower() not in SEARCH_MODES:
+        return {"error": f"mode must be one of: {', '.join(SEARCH_MODES)}"}
+
+    try:
+        results = search_reports_batch(
+            [q.query for q in request.queries],
+            n=[q.n for q in request.queries],
+            mode=request.mode,
+            where=request.where,
+            mmr=request.mmr,
+        )
+    except ValueError as e:
+        return {"error": f"Invalid filter: {e}"}
+
+    score_field = "scores" if any("scores" in r for r in results) else "distances"
+    columns = {"ids": [], "documents": [], "metadatas": [], score_field: []}
+    offsets = [0]
+
+    for result in results:
+        for field, values in columns.items():
+            values.extend(result.get(field, [[]])[0])
+        offsets.append(len(columns["ids"]))
+
+    return {
+        "queries": [q.query for q in request.queries],
+        "offsets": offsets,
+        **columns,
+    }
+
+
+@router.get("/rag/cache_stats")
+def rag_cache_stats():
+    """
+    Hit ratios of the query embedding and top-k result caches.
+    """
+    return query_cache_stats()
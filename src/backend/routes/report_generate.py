@@ -3,31 +3,61 @@
 import os
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
-from src.agent.economic_agent import analyze_economy
-from src.backend.tools.pdf_generator import generate_economic_report
+from src.agent import report_jobs
 
 router = APIRouter()
 
-@router.get("/report/generate")
-def generate_report(query: str, country: str = None):
-    """
-    Generates a PDF report for the given economic query.
-    """
-    result = analyze_economy(query, country)
 
-    os.makedirs("reports_out", exist_ok=True)
-    filepath = f"reports_out/report_{result['country']}.pdf"
+def _public(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k != "artifact"}
 
-    generate_economic_report(
-        filepath=filepath,
-        country=result["country"],
-        indicators=result["indicators_used"],
-        analysis=result["analysis"],
-        rag_passages=result["rag_passages"],
-    )
 
+def _pdf_response(job: dict):
+    # Old artifacts are pruned from REPORTS_DIR
+    if not os.path.exists(job["artifact"]):
+        return {"error": "Report file is no longer available; submit the request again"}
     return FileResponse(
-        filepath,
+        job["artifact"],
         media_type="application/pdf",
-        filename=f"Economic_Report_{result['country']}.pdf"
+        filename=f"Economic_Report_{job['country']}.pdf"
     )
+
+
+@router.post("/report/jobs")
+async def submit_report(query: str, country: str = None, fused: bool = None):
+    """
+    Queue a PDF report. Poll /report/jobs/{id}, then fetch .../download.
+    Identical requests on unchanged data come back "done" immediately.
+    """
+    return _public(await report_jobs.submit(query, country, fused=fused))
+
+
+@router.get("/report/jobs/{job_id}")
+async def report_status(job_id: str):
+    job = report_jobs.get_job(job_id)
+    if job is None:
+        return {"error": "Unknown job id"}
+    return _public(job)
+
+
+@router.get("/report/jobs/{job_id}/download")
+async def download_report(job_id: str):
+    job = report_jobs.get_job(job_id)
+    if job is None:
+        return {"error": "Unknown job id"}
+    if job["status"] != "done":
+        return {"error": f"Report is not ready (status: {job['status']})", "status": job["status"]}
+    return _pdf_response(job)
+
+
+@router.get("/report/generate")
+async def generate_report(query: str, country: str = None, fused: bool = None):
+    """
+    Generates a PDF report for the given economic query.
+    Submits a job and waits for it; kept for existing clients.
+    """
+    job = await report_jobs.wait((await report_jobs.submit(query, country, fused=fused))["id"])
+
+    if job["status"] != "done":
+        return {"error": job["error"] or "Report generation failed"}
+    return _pdf_response(job)
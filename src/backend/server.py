@@ -1,4 +1,15 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import importlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from src.agent import report_jobs
+from src.backend.config import STARTUP_TIMING, STARTUP_WARMUP
+from src.backend.rags import rag_store
+from src.backend.tools import http_client, llm_client, metrics, profiler, query_parser
 from src.backend.routes.health import router as health_router
 from src.backend.routes.ask_basic import router as ask_basic_router 
 from src.backend.routes.macro_basic import router as macro_basic_router
@@ -8,6 +19,22 @@ from src.backend.routes.rag_ingest import router as rag_ingest_router
 from src.backend.routes.rag_search import router as rag_search_router
 from src.backend.routes.report_generate import router as report_generate_router
 from src.backend.routes.macro_live import router as macro_live_router
+from src.backend.routes.macro_batch import router as macro_batch_router
+from src.backend.routes.metrics import router as metrics_router
+from src.backend.routes.profiles import router as profiles_router
+
+# Heavy clients and libraries are created on first use; this is what
+# STARTUP_WARMUP builds ahead of time instead (name -> loader)
+WARMUP_STEPS = {
+    "llm_client": llm_client.get_client,
+    "vector_store": rag_store.warm_up,
+    "query_parser": query_parser.warm_up,
+    "reportlab": lambda: importlib.import_module("reportlab.platypus"),
+}
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+
 
 
 
@@ -15,13 +42,52 @@ from src.backend.routes.macro_live import router as macro_live_router
 
 
 
+async def _warm_up(timings: dict):
+    """
+    Run WARMUP_STEPS in a worker thread, one at a time, while the server
+    already accepts requests. A failing step is reported and left lazy.
+    """
+    for name, load in WARMUP_STEPS.items():
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(load)
+            timings[name] = round(time.perf_counter() - started, 4)
+        except Exception as e:
+            timings[name] = f"failed: {e.__class__.__name__}: {e}"
+
+    if STARTUP_TIMING:
+        print(f"[startup] warm-up: {timings}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The LLM client, vector store and embeddings are lazy singletons:
+    # nothing slow happens here unless STARTUP_WARMUP is set
+    app.state.startup = {"import_seconds": round(IMPORT_SECONDS, 4), "warmup": {}}
+    if STARTUP_TIMING:
+        print(f"[startup] server import: {IMPORT_SECONDS:.3f}s")
+
+    warmup = asyncio.create_task(_warm_up(app.state.startup["warmup"])) if STARTUP_WARMUP else None
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    await report_jobs.shutdown()
+    # Release pooled upstream connections on shutdown
+    await llm_client.close()
+    http_client.close()
 
 
 app = FastAPI(
     title="Global Economic Intelligence Agent",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Per-route latency histograms for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+# Admin-only per-request profiling (X-Profile: 1 + X-Admin-Token)
+app.add_middleware(profiler.ProfilingMiddleware)
+
 # Register routes
 app.include_router(health_router)
 app.include_router(ask_basic_router)
@@ -32,6 +98,9 @@ app.include_router(rag_ingest_router)
 app.include_router(rag_search_router)
 app.include_router(report_generate_router)
 app.include_router(macro_live_router)
+app.include_router(macro_batch_router)
+app.include_router(metrics_router)
+app.include_router(profiles_router)
 
 
 
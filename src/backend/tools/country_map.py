@@ -1,30 +1,96 @@
 # src/backend/tools/country_map.py
+#
+# Aliases on top of the ISO names from pycountry: short forms, everyday
+# names, demonyms and the aggregates the World Bank reports. Entries of three
+# letters or fewer are codes and only match in upper case ("US", not "us").
 
 COUNTRY_MAP = {
     "united states": "US",
     "usa": "US",
     "us": "US",
+    "u.s.": "US",
     "america": "US",
 
     "germany": "DE",
     "deutschland": "DE",
+    "german": "DE",
     "de": "DE",
 
     "france": "FR",
+    "french": "FR",
     "fr": "FR",
 
     "united kingdom": "GB",
     "uk": "GB",
+    "u.k.": "GB",
     "britain": "GB",
+    "great britain": "GB",
+    "british": "GB",
+    "england": "GB",
 
     "european union": "EU",
     "eurozone": "EU",
+    "euro area": "EU",
+    "euro zone": "EU",
     "eu": "EU",
+
+    "italian": "IT",
+    "spanish": "ES",
+    "dutch": "NL",
+    "holland": "NL",
+    "swiss": "CH",
+    "swedish": "SE",
+    "polish": "PL",
+    "czech republic": "CZ",
+    "turkey": "TR",
+    "turkish": "TR",
+    "russia": "RU",
+    "russian": "RU",
+    "ukrainian": "UA",
+    "japanese": "JP",
+    "chinese": "CN",
+    "indian": "IN",
+    "south korea": "KR",
+    "korean": "KR",
+    "north korea": "KP",
+    "vietnam": "VN",
+    "laos": "LA",
+    "syria": "SY",
+    "brazilian": "BR",
+    "mexican": "MX",
+    "canadian": "CA",
+    "argentine": "AR",
+    "argentinian": "AR",
+    "australian": "AU",
+    "ivory coast": "CI",
+    "uae": "AE",
+    "emirates": "AE",
+    "saudi": "SA",
+    "saudi arabian": "SA",
+    "south african": "ZA",
+    "nigerian": "NG",
+    "egyptian": "EG",
+    "dr congo": "CD",
+    "drc": "CD",
+}
+
+# Regions whose names contain a country alias ("Latin America" holds
+# "america"). Matched as phrases of their own so the longer name wins and
+# no country is reported for them.
+NOT_COUNTRIES = {
+    "latin america",
+    "south america",
+    "central america",
+    "north america",
 }
 
+
 def detect_country(text: str, default="US"):
-    text = text.lower()
-    for name, code in COUNTRY_MAP.items():
-        if name in text:
-            return code
-    return default
+    """
+    First country mentioned in the text, or `default` if there is none.
+    """
+    # Imported here: the parser compiles its pattern from this module's table
+    from src.backend.tools.query_parser import find_countries
+
+    countries = find_countries(text)
+    return countries[0] if countries else default
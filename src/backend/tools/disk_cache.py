@@ -0,0 +1,168 @@
+# src/backend/tools/disk_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class DiskCache:
+    """
+    Small persistent key/value cache backed by SQLite.
+
+    - ttl: seconds an entry is considered fresh (None = never expires)
+    - stale_ttl: extra seconds an expired entry may still be served as "stale"
+    - max_entries: least-recently-used entries are evicted above this size
+    """
+
+    def __init__(self, path: str, table: str, ttl=None, stale_ttl=0, max_entries=10000):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                tag TEXT,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_tag ON {table}(tag)")
+        self._conn.commit()
+
+    def _state(self, created: float, now: float):
+        """
+        Classify an entry as "fresh", "stale" or None (expired).
+        """
+        if self.ttl is None:
+            return "fresh"
+        age = now - created
+        if age <= self.ttl:
+            return "fresh"
+        if age <= self.ttl + self.stale_ttl:
+            return "stale"
+        return None
+
+    def get(self, key: str):
+        """
+        Return (value, state) where state is "fresh", "stale" or None on a miss.
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._counters["misses"] += 1
+                return None, None
+
+            state = self._state(row[1], now)
+            if state is None:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self._counters["misses"] += 1
+                return None, None
+
+            self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._counters["hits" if state == "fresh" else "stale_hits"] += 1
+
+        return json.loads(row[0]), state
+
+    def peek(self, key: str, expired: bool = True):
+        """
+        Return the stored value without touching counters or access times.
+        With expired=False an entry past its stale window counts as missing.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (not expired and self._state(row[1], time.time()) is None):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value, tag: str = None):
+        """
+        Store a JSON-serializable value, evicting LRU entries if over capacity.
+        """
+        now = time.time()
+        payload = json.dumps(value)
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, tag, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, tag, now, now),
+            )
+            self._counters["writes"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Drop least-recently-used entries above max_entries (lock must be held).
+        """
+        if not self.max_entries:
+            return
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._counters["evictions"] += overflow
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_tag(self, tag: str) -> int:
+        """
+        Drop every entry stored with the given tag. Returns the number removed.
+        """
+        with self._lock:
+            removed = self._conn.execute(f"DELETE FROM {self.table} WHERE tag = ?", (tag,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Counters since process start plus the current number of entries.
+        """
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            stats = dict(self._counters)
+
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["entries"] = entries
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,140 @@
+# src/backend/tools/http_client.py
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+from src.backend.config import (
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_MAX_BACKOFF,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+)
+
+# Upstream statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# One event loop thread owns the pooled client, so every caller
+# (sync route threads or other event loops) shares the same connections.
+_loop = None
+_client = None
+_lock = threading.Lock()
+
+
+def _start_loop():
+    global _loop, _client
+
+    with _lock:
+        if _loop is not None:
+            return _loop
+
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="http-client", daemon=True).start()
+
+        async def _make_client():
+            return httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                ),
+                follow_redirects=True,
+            )
+
+        _client = asyncio.run_coroutine_threadsafe(_make_client(), loop).result()
+        _loop = loop
+        return _loop
+
+
+def _retry_after(value: str):
+    """
+    Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), or None.
+    """
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, response: httpx.Response = None):
+    """
+    Exponential backoff with full jitter, capped at HTTP_MAX_BACKOFF; honours
+    Retry-After when given. Returns None when the server asks for a longer
+    wait than that: retrying would only hold the caller, so give up.
+    """
+    if response is not None:
+        wait = _retry_after(response.headers.get("Retry-After", ""))
+        if wait is not None:
+            return wait if wait <= HTTP_MAX_BACKOFF else None
+    return random.uniform(0, min(HTTP_BACKOFF_BASE * (2 ** attempt), HTTP_MAX_BACKOFF))
+
+
+async def _get(url: str, params: dict = None) -> httpx.Response:
+    """
+    GET with retries on transport errors, timeouts, 429 and 5xx.
+    """
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        last_attempt = attempt == HTTP_MAX_RETRIES
+
+        try:
+            response = await _client.get(url, params=params)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUSES or last_attempt:
+            return response
+
+        delay = _backoff(attempt, response)
+        if delay is None:
+            return response
+        await asyncio.sleep(delay)
+
+
+async def get(url: str, params: dict = None) -> httpx.Response:
+    """
+    Async GET through the shared pooled client (usable from any event loop).
+    """
+    loop = _start_loop()
+    if asyncio.get_running_loop() is loop:
+        return await _get(url, params)
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_get(url, params), loop))
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the client loop and block until it finishes.
+    Thin bridge for sync callers.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _start_loop()).result()
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the client loop without waiting for it.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _start_loop())
+
+
+def close():
+    """
+    Close pooled connections and stop the client loop.
+    """
+    global _loop, _client
+
+    with _lock:
+        if _loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop, _client = None, None
@@ -0,0 +1,123 @@
+# src/backend/tools/indicator_map.py
+#
+# Keyword → World Bank indicator catalogue used to read indicators out of a
+# free-text query. Longer phrases win over their prefixes ("gdp per capita"
+# over "gdp"). Any indicator code written out in full ("NY.GDP.MKTP.KD.ZG")
+# is recognised as well, so codes missing here can still be asked for.
+
+INDICATOR_MAP = {
+    # ---- Output ----
+    "gdp": "NY.GDP.MKTP.KD.ZG",
+    "growth": "NY.GDP.MKTP.KD.ZG",
+    "gdp growth": "NY.GDP.MKTP.KD.ZG",
+    "economic growth": "NY.GDP.MKTP.KD.ZG",
+    "real gdp": "NY.GDP.MKTP.KD.ZG",
+    "recession": "NY.GDP.MKTP.KD.ZG",
+    "gdp level": "NY.GDP.MKTP.CD",
+    "size of the economy": "NY.GDP.MKTP.CD",
+    "gdp per capita": "NY.GDP.PCAP.CD",
+    "income per capita": "NY.GDP.PCAP.CD",
+    "gdp per capita growth": "NY.GDP.PCAP.KD.ZG",
+    "gni": "NY.GNP.MKTP.CD",
+    "gni per capita": "NY.GNP.PCAP.CD",
+    "gdp deflator": "NY.GDP.DEFL.KD.ZG",
+    "investment": "NE.GDI.TOTL.ZS",
+    "gross capital formation": "NE.GDI.TOTL.ZS",
+    "savings": "NY.GNS.ICTR.ZS",
+    "household consumption": "NE.CON.PRVT.ZS",
+    "consumer spending": "NE.CON.PRVT.ZS",
+    "manufacturing": "NV.IND.MANF.ZS",
+    "industrial output": "NV.IND.TOTL.ZS",
+    "agricultural output": "NV.AGR.TOTL.ZS",
+
+    # ---- Prices and money ----
+    "inflation": "FP.CPI.TOTL.ZG",
+    "cpi": "FP.CPI.TOTL.ZG",
+    "consumer prices": "FP.CPI.TOTL.ZG",
+    "price level": "FP.CPI.TOTL",
+    "interest rate": "FR.INR.LEND",
+    "interest rates": "FR.INR.LEND",
+    "lending rate": "FR.INR.LEND",
+    "real interest rate": "FR.INR.RINR",
+    "deposit rate": "FR.INR.DPST",
+    "exchange rate": "PA.NUS.FCRF",
+    "broad money": "FM.LBL.BMNY.GD.ZS",
+    "money supply": "FM.LBL.BMNY.GD.ZS",
+    "domestic credit": "FS.AST.PRVT.GD.ZS",
+    "private credit": "FS.AST.PRVT.GD.ZS",
+    "reserves": "FI.RES.TOTL.CD",
+    "foreign reserves": "FI.RES.TOTL.CD",
+
+    # ---- Labour ----
+    "unemployment": "SL.UEM.TOTL.ZS",
+    "jobless": "SL.UEM.TOTL.ZS",
+    "jobless rate": "SL.UEM.TOTL.ZS",
+    "youth unemployment": "SL.UEM.1524.ZS",
+    "labor force participation": "SL.TLF.CACT.ZS",
+    "labour force participation": "SL.TLF.CACT.ZS",
+    "employment": "SL.EMP.TOTL.SP.ZS",
+    "labor force": "SL.TLF.TOTL.IN",
+    "labour force": "SL.TLF.TOTL.IN",
+
+    # ---- Trade and external ----
+    "exports": "NE.EXP.GNFS.ZS",
+    "export": "NE.EXP.GNFS.ZS",
+    "imports": "NE.IMP.GNFS.ZS",
+    "import": "NE.IMP.GNFS.ZS",
+    "trade": "NE.TRD.GNFS.ZS",
+    "trade openness": "NE.TRD.GNFS.ZS",
+    "current account": "BN.CAB.XOKA.GD.ZS",
+    "current account balance": "BN.CAB.XOKA.GD.ZS",
+    "fdi": "BX.KLT.DINV.WD.GD.ZS",
+    "foreign direct investment": "BX.KLT.DINV.WD.GD.ZS",
+    "remittances": "BX.TRF.PWKR.DT.GD.ZS",
+    "external debt": "DT.DOD.DECT.CD",
+    "tariff": "TM.TAX.MRCH.WM.AR.ZS",
+    "tariffs": "TM.TAX.MRCH.WM.AR.ZS",
+    "tourism": "ST.INT.ARVL",
+
+    # ---- Public finances ----
+    "debt": "GC.DOD.TOTL.GD.ZS",
+    "public debt": "GC.DOD.TOTL.GD.ZS",
+    "government debt": "GC.DOD.TOTL.GD.ZS",
+    "budget balance": "GC.NLD.TOTL.GD.ZS",
+    "fiscal balance": "GC.NLD.TOTL.GD.ZS",
+    "deficit": "GC.NLD.TOTL.GD.ZS",
+    "budget deficit": "GC.NLD.TOTL.GD.ZS",
+    "tax revenue": "GC.TAX.TOTL.GD.ZS",
+    "taxes": "GC.TAX.TOTL.GD.ZS",
+    "government spending": "GC.XPN.TOTL.GD.ZS",
+    "public spending": "GC.XPN.TOTL.GD.ZS",
+    "military spending": "MS.MIL.XPND.GD.ZS",
+    "defense spending": "MS.MIL.XPND.GD.ZS",
+    "defence spending": "MS.MIL.XPND.GD.ZS",
+    "education spending": "SE.XPD.TOTL.GD.ZS",
+    "health spending": "SH.XPD.CHEX.GD.ZS",
+
+    # ---- People and environment ----
+    "population": "SP.POP.TOTL",
+    "population growth": "SP.POP.GROW",
+    "life expectancy": "SP.DYN.LE00.IN",
+    "fertility": "SP.DYN.TFRT.IN",
+    "fertility rate": "SP.DYN.TFRT.IN",
+    "urbanization": "SP.URB.TOTL.IN.ZS",
+    "urbanisation": "SP.URB.TOTL.IN.ZS",
+    "poverty": "SI.POV.DDAY",
+    "poverty rate": "SI.POV.DDAY",
+    "inequality": "SI.POV.GINI",
+    "gini": "SI.POV.GINI",
+    "co2": "EN.GHG.CO2.PC.CE.AR5",
+    "co2 emissions": "EN.GHG.CO2.PC.CE.AR5",
+    "carbon emissions": "EN.GHG.CO2.PC.CE.AR5",
+    "emissions": "EN.GHG.CO2.PC.CE.AR5",
+    "energy use": "EG.USE.PCAP.KG.OE",
+    "renewable energy": "EG.FEC.RNEW.ZS",
+    "internet users": "IT.NET.USER.ZS",
+    "literacy": "SE.ADT.LITR.ZS",
+}
+
+# Used when a query names no indicator at all
+DEFAULT_INDICATORS = [
+    "NY.GDP.MKTP.KD.ZG",     # GDP growth
+    "FP.CPI.TOTL.ZG",        # Inflation
+]
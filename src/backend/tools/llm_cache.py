@@ -0,0 +1,94 @@
+# src/backend/tools/llm_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+from src.backend.config import CACHE_DIR, LLM_CACHE_ENABLED, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+from src.backend.tools import metrics
+from src.backend.tools.disk_cache import DiskCache
+from src.backend.tools.llm_client import chat_completion
+
+# Persistent cache of completions, keyed by a hash of (model, prompt)
+completion_cache = DiskCache(
+    os.path.join(CACHE_DIR, "llm.sqlite"),
+    table="completions",
+    ttl=LLM_CACHE_TTL,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+)
+metrics.register_cache("llm_completions", completion_cache.stats)
+
+
+def prompt_key(model: str, messages: list, **params) -> str:
+    """
+    Content address of a completion request.
+    """
+    payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def cached_completion(client, model: str, messages: list, tag: str = None, **params) -> str:
+    """
+    Return the completion text for this request, calling the (async) model only on a miss.
+
+    tag groups entries derived from the same source data (e.g. one World Bank
+    series) so they can be dropped together with invalidate().
+    """
+    if not LLM_CACHE_ENABLED:
+        response = await chat_completion(client, model=model, messages=messages, **params)
+        return response.choices[0].message.content
+
+    key = prompt_key(model, messages, **params)
+
+    # SQLite reads and writes run in a worker thread, off the event loop
+    cached, state = await asyncio.to_thread(completion_cache.get, key)
+    if state == "fresh":
+        return cached
+
+    response = await chat_completion(client, model=model, messages=messages, **params)
+    content = response.choices[0].message.content
+
+    await asyncio.to_thread(completion_cache.set, key, content, tag)
+    return content
+
+
+async def stream_completion(client, model: str, messages: list, tag: str = None, **params):
+    """
+    Like cached_completion, but yields text deltas as the model produces them.
+    A cache hit is yielded as a single delta; a full streamed answer is stored.
+    """
+    key = prompt_key(model, messages, **params)
+
+    if LLM_CACHE_ENABLED:
+        cached, state = await asyncio.to_thread(completion_cache.get, key)
+        if state == "fresh":
+            yield cached
+            return
+
+    stream = await chat_completion(client, model=model, messages=messages, stream=True, **params)
+
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    if LLM_CACHE_ENABLED:
+        await asyncio.to_thread(completion_cache.set, key, "".join(parts), tag)
+
+
+def invalidate(tag: str) -> int:
+    """
+    Drop all cached completions built from the tagged source data.
+    """
+    return completion_cache.delete_tag(tag)
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counters for the LLM completion cache.
+    """
+    return completion_cache.stats()
@@ -0,0 +1,90 @@
+# src/backend/tools/llm_client.py
+
+import threading
+import time
+import httpx
+from src.backend.config import (
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    LLM_TIMEOUT,
+    LLM_MAX_CONNECTIONS,
+)
+from src.backend.tools import metrics
+
+# One AsyncOpenAI client (and connection pool) per process, built on first
+# use and closed by the app lifespan. Model calls are awaited on the event
+# loop, so slow completions don't hold a worker thread each.
+_client = None
+# Startup warm-up may build the client from a worker thread
+_lock = threading.Lock()
+
+
+def get_client() -> "AsyncOpenAI":
+    global _client
+    if _client is not None:
+        return _client
+
+    if OPENAI_API_KEY is None:
+        raise ValueError("OPENAI_API_KEY is not set in .env")
+
+    # The openai package is slow to import; keep it off the startup path
+    from openai import AsyncOpenAI
+
+    with _lock:
+        if _client is None:
+            _client = AsyncOpenAI(
+                api_key=OPENAI_API_KEY,
+                base_url=OPENAI_BASE_URL,
+                timeout=LLM_TIMEOUT,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                    ),
+                ),
+            )
+    return _client
+
+
+async def chat_completion(client=None, **params):
+    """
+    client.chat.completions.create(**params) with upstream latency, error and
+    token metrics. Streams ask for a final usage chunk (empty choices, which
+    callers already skip) and are counted as they are consumed.
+    """
+    client = client or get_client()
+    model = params.get("model")
+    if params.get("stream"):
+        params.setdefault("stream_options", {"include_usage": True})
+
+    started = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(**params)
+    except Exception as e:
+        metrics.UPSTREAM_ERRORS.inc("openai", e.__class__.__name__)
+        raise
+    finally:
+        metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - started, "openai")
+
+    if params.get("stream"):
+        return _metered_stream(response, model)
+    metrics.record_llm_usage(model, response.usage)
+    return response
+
+
+async def _metered_stream(stream, model: str):
+    try:
+        async for chunk in stream:
+            if chunk.usage is not None:
+                metrics.record_llm_usage(model, chunk.usage)
+            yield chunk
+    except Exception as e:
+        metrics.UPSTREAM_ERRORS.inc("openai", e.__class__.__name__)
+        raise
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -1,43 +1,344 @@
 # src/backend/tools/macro_fetcher.py
 
-import requests
-import pandas as pd
+import asyncio
+import json
+import os
+import re
+import time
+import httpx
+from src.backend.config import (
+    CACHE_DIR, WB_API_URL, WB_CACHE_TTL, WB_CACHE_STALE_TTL, WB_CACHE_MAX_ENTRIES,
+    WB_PER_PAGE, WB_PAGE_CONCURRENCY,
+)
+from src.backend.tools import http_client, llm_cache, metrics
+from src.backend.tools.disk_cache import DiskCache
+from src.backend.tools.series import IndicatorSeries
 
-WORLD_BANK_BASE_URL = "https://api.worldbank.org/v2/country/{country}/indicator/{indicator}?format=json"
+WORLD_BANK_BASE_URL = WB_API_URL + "/country/{country}/indicator/{indicator}"
 
-def get_indicator(country: str, indicator: str):
+# per_page bounds for callers. The floor is the World Bank's own default:
+# smaller pages only multiply the upstream requests for the same rows
+MIN_PER_PAGE = 50
+MAX_PER_PAGE = 10000
+
+# date= takes a year (2020) or a range of years (2000:2024)
+_DATE_RE = re.compile(r"^(\d{4})(?::(\d{4}))?$")
+
+# Persistent cache of cleaned series (columnar JSON), keyed by (country, indicator)
+series_cache = DiskCache(
+    os.path.join(CACHE_DIR, "worldbank.sqlite"),
+    table="series",
+    ttl=WB_CACHE_TTL,
+    stale_ttl=WB_CACHE_STALE_TTL,
+    max_entries=WB_CACHE_MAX_ENTRIES,
+)
+metrics.register_cache("worldbank", series_cache.stats)
+
+# Keys currently being refreshed in the background
+_refreshing = set()
+
+
+def _cache_key(country: str, indicator: str, variant: str = "") -> str:
+    return f"{country.upper()}|{indicator}|{variant}"
+
+
+def _window_error(date: str = None, mrv: int = None, per_page: int = None):
     """
-    Fetches a macroeconomic indicator from the World Bank API.
-    
-    Example:
-        country="US", indicator="NY.GDP.MKTP.KD.ZG" (GDP growth)
+    Why a date / mrv / per_page combination is invalid, or None if it is fine.
     """
-    url = WORLD_BANK_BASE_URL.format(country=country, indicator=indicator)
+    if date is not None:
+        match = _DATE_RE.match(date)
+        if not match:
+            return "date must be a year (2020) or a range of years (2000:2024)"
+        if match.group(2) and match.group(1) > match.group(2):
+            return "date range must run from the earlier to the later year"
+    if mrv is not None and mrv < 1:
+        return "mrv must be at least 1"
+    if per_page is not None and not MIN_PER_PAGE <= per_page <= MAX_PER_PAGE:
+        return f"per_page must be between {MIN_PER_PAGE} and {MAX_PER_PAGE}"
+    return None
+
+
+def _window_variant(date: str = None, mrv: int = None) -> str:
+    """
+    Cache key variant for a date / mrv window. per_page is left out: it only
+    changes how the rows travel, not which rows come back.
+    """
+    parts = []
+    if date:
+        parts.append(f"date={date}")
+    if mrv:
+        parts.append(f"mrv={mrv}")
+    return ";".join(parts)
+
+
+def series_tag(country: str, indicator: str) -> str:
+    """
+    Tag shared by everything derived from one series (e.g. cached LLM summaries).
+    """
+    return _cache_key(country, indicator)
+
+
+def _store(key: str, data):
+    """
+    Cache a fresh series; if it differs from what was cached before,
+    drop LLM completions that were built from the old values.
+    """
+    payload = data.to_columns() if isinstance(data, IndicatorSeries) else data
+    previous = series_cache.peek(key)
+    series_cache.set(key, payload)
+
+    # Series cached as records (before the columnar format) compare by content
+    if previous is not None and isinstance(data, IndicatorSeries):
+        previous = IndicatorSeries.load(previous).to_columns()
+
+    if previous is not None and json.dumps(previous) != json.dumps(payload):
+        llm_cache.invalidate(key)
+
 
-    response = requests.get(url)
+def _is_error(data) -> bool:
+    return isinstance(data, dict) and "error" in data
+
+
+async def _get_json(url: str, params: dict):
+    """
+    One World Bank API call. Returns the [metadata, records] body, or an
+    {"error": ...} dict; latency and failures are recorded in metrics.
+    """
+    started = time.perf_counter()
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError as e:
+        metrics.UPSTREAM_ERRORS.inc("worldbank", e.__class__.__name__)
+        return {"error": f"Failed to fetch data: {e.__class__.__name__}"}
+    finally:
+        metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - started, "worldbank")
 
     if response.status_code != 200:
+        metrics.UPSTREAM_ERRORS.inc("worldbank", f"HTTP {response.status_code}")
         return {"error": f"Failed to fetch data: HTTP {response.status_code}"}
 
     data = response.json()
 
     # World Bank returns a two-element list: metadata, actual data list
     if not isinstance(data, list) or len(data) < 2:
+        metrics.UPSTREAM_ERRORS.inc("worldbank", "invalid_response")
         return {"error": "Invalid API response structure."}
 
-    records = data[1]  # list of values (one per year)
+    return data
+
+
+async def _get_all_pages(url: str, params: dict, per_page: int = None):
+    """
+    Every record of a paged World Bank response. The first page says how many
+    pages there are; the rest are fetched concurrently, WB_PAGE_CONCURRENCY
+    at a time. One failed page fails the whole fetch, so a truncated series
+    is never cached.
+    """
+    params = {**params, "per_page": per_page or WB_PER_PAGE}
+
+    first = await _get_json(url, {**params, "page": 1})
+    if _is_error(first):
+        return first
+
+    records = list(first[1] or [])
+    pages = int(first[0].get("pages") or 1) if isinstance(first[0], dict) else 1
+    if pages <= 1:
+        return records
+
+    semaphore = asyncio.Semaphore(WB_PAGE_CONCURRENCY)
+
+    async def fetch_page(page: int):
+        async with semaphore:
+            return await _get_json(url, {**params, "page": page})
+
+    for data in await asyncio.gather(*(fetch_page(page) for page in range(2, pages + 1))):
+        if _is_error(data):
+            return data
+        records.extend(data[1] or [])
+
+    return records
+
+
+async def _fetch_indicator(country: str, indicator: str, date: str = None, mrv: int = None, per_page: int = None):
+    """
+    Fetch and clean one indicator series (all pages) straight from the World Bank API.
+    """
+    url = WORLD_BANK_BASE_URL.format(country=country, indicator=indicator)
+
+    params = {"format": "json"}
+    if date:
+        params["date"] = date
+    if mrv:
+        params["mrv"] = mrv
+
+    records = await _get_all_pages(url, params, per_page)  # list of values (one per year)
+    if _is_error(records):
+        return records
+
+    # Latest year first, missing values as NaN
+    return IndicatorSeries.from_records(records)
+
+
+async def _refresh(key: str, fetch):
+    """
+    Re-fetch a stale entry and store it if the upstream call succeeds.
+    """
+    try:
+        data = await fetch()
+        if not _is_error(data):
+            await asyncio.to_thread(_store, key, data)
+    finally:
+        _refreshing.discard(key)
 
-    # Clean into a simple dataframe
-    df = pd.DataFrame(records)
 
-    # Keep only year/value
-    df = df[["date", "value"]]
+def _revalidate(key: str, fetch):
+    """
+    Schedule one background refresh per stale key.
+    """
+    if key not in _refreshing:
+        _refreshing.add(key)
+        http_client.submit(_refresh(key, fetch))
+
+
+async def aget_indicator(
+    country: str,
+    indicator: str,
+    use_cache: bool = True,
+    date: str = None,
+    mrv: int = None,
+    per_page: int = None,
+):
+    """
+    Fetches a macroeconomic indicator from the World Bank API as an
+    IndicatorSeries (latest year first), or an {"error": ...} dict.
+
+    By default the full history is returned, following every page. `date`
+    narrows it to a year or a range ("2000:2024"), `mrv` to the N most recent
+    years; `per_page` sets the upstream page size (default: WB_PER_PAGE).
+
+    Results are cached on disk per window. Fresh entries are served directly,
+    stale entries are served immediately while a background refresh runs.
+
+    Example:
+        country="US", indicator="NY.GDP.MKTP.KD.ZG" (GDP growth)
+        country="US", indicator="NY.GDP.MKTP.KD.ZG", date="2000:2024"
+    """
+    error = _window_error(date, mrv, per_page)
+    if error:
+        return {"error": error}
 
-    # Convert to numeric where possible
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    key = _cache_key(country, indicator, variant=_window_variant(date, mrv))
 
-    # Sort by year desc (latest first)
-    df = df.sort_values("date", ascending=False)
+    def fetch():
+        return _fetch_indicator(country, indicator, date, mrv, per_page)
+
+    # SQLite reads and writes run in a worker thread, off the event loop
+    if use_cache:
+        cached, state = await asyncio.to_thread(series_cache.get, key)
+        if state == "fresh":
+            return IndicatorSeries.load(cached)
+        if state == "stale":
+            _revalidate(key, fetch)
+            return IndicatorSeries.load(cached)
+
+    data = await fetch()
+
+    # Errors are never cached
+    if not _is_error(data):
+        await asyncio.to_thread(_store, key, data)
+
+    return data
+
+
+def get_indicator(
+    country: str,
+    indicator: str,
+    use_cache: bool = True,
+    date: str = None,
+    mrv: int = None,
+    per_page: int = None,
+):
+    """
+    Sync wrapper around aget_indicator for blocking callers.
+    """
+    return http_client.run_sync(aget_indicator(country, indicator, use_cache, date, mrv, per_page))
+
+
+async def _fetch_latest_values(countries: list, indicator: str):
+    """
+    Fetch the most recent non-empty value for many countries in one
+    upstream request, using the World Bank "US;DE;FR" (or "all") syntax.
+    """
+    url = WORLD_BANK_BASE_URL.format(country=";".join(countries), indicator=indicator)
 
-    # Return top rows as list for JSON compatibility
-    return df.to_dict(orient="records")
+    records = await _get_all_pages(url, {"format": "json", "mrnev": 1})
+    if _is_error(records):
+        return records
+
+    latest = []
+    for record in records:
+        if record.get("value") is None:
+            continue
+        latest.append({
+            "country": record["country"]["id"],
+            "iso3": record.get("countryiso3code"),
+            "date": record["date"],
+            "value": float(record["value"]),
+        })
+
+    return latest
+
+
+async def aget_latest_values(countries: list, indicator: str, use_cache: bool = True):
+    """
+    Latest value per country for one indicator, from a single upstream call.
+
+    Example:
+        countries=["US", "DE", "FR"], indicator="FP.CPI.TOTL.ZG"
+        countries=["all"] for every economy the World Bank reports
+    """
+    # The API can't mix "all" with codes, and "all" covers them anyway
+    if any(c.lower() == "all" for c in countries):
+        countries = ["all"]
+    else:
+        countries = sorted({c.upper() for c in countries})
+    key = _cache_key(";".join(countries), indicator, variant="latest")
+
+    if use_cache:
+        cached, state = await asyncio.to_thread(series_cache.get, key)
+        if state == "fresh":
+            return cached
+        if state == "stale":
+            _revalidate(key, lambda: _fetch_latest_values(countries, indicator))
+            return cached
+
+    data = await _fetch_latest_values(countries, indicator)
+
+    if not _is_error(data):
+        await asyncio.to_thread(_store, key, data)
+
+    return data
+
+
+def get_latest_values(countries: list, indicator: str, use_cache: bool = True):
+    """
+    Sync wrapper around aget_latest_values for blocking callers.
+    """
+    return http_client.run_sync(aget_latest_values(countries, indicator, use_cache))
+
+
+def cached_series(country: str, indicator: str):
+    """
+    The cached series for (country, indicator) while fresh or stale, or None:
+    an expired entry is no longer what a fetch would return.
+    """
+    cached = series_cache.peek(_cache_key(country, indicator), expired=False)
+    return IndicatorSeries.load(cached) if cached is not None else None
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counters for the World Bank series cache.
+    """
+    return series_cache.stats()
@@ -0,0 +1,218 @@
+# src/backend/tools/metrics.py
+#
+# In-process metrics rendered in the Prometheus text format on /metrics.
+# Recording a sample is a dict lookup, a bisect and a few additions under a
+# lock; nothing is formatted until somebody scrapes. Cache hit counters are
+# not recorded here at all: the caches already count, and their stats()
+# are read at scrape time.
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+# cache name -> stats() callable
+_caches = {}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic counter per label set.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram per label set. Bucket counts are kept
+    non-cumulative and summed up only when rendered.
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self) -> list:
+        with self._lock:
+            series = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {repr(float(total))}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+
+# ---- Metrics ----
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template, method and status (streams: until the last byte).",
+    ("route", "method", "status"),
+)
+STAGE_LATENCY = Histogram(
+    "agent_stage_duration_seconds",
+    "Duration of agent pipeline stages (detect, fetch, summarize, rag, fused, synthesis, render_pdf).",
+    ("stage",),
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream services including retries (streams: until the response starts).",
+    ("service",),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Failed calls to upstream services by reason.",
+    ("service", "reason"),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported in LLM completion responses.",
+    ("model", "type"),
+)
+
+
+def stage_timer(stage: str):
+    """
+    Context manager timing one agent pipeline stage.
+    """
+    return STAGE_LATENCY.time(stage)
+
+
+def record_llm_usage(model: str, usage):
+    """
+    Count prompt/completion tokens from a completion's usage field (if any).
+    """
+    if usage is None:
+        return
+    LLM_TOKENS.inc(model, "prompt", amount=usage.prompt_tokens or 0)
+    LLM_TOKENS.inc(model, "completion", amount=usage.completion_tokens or 0)
+
+
+def register_cache(name: str, stats):
+    """
+    Export a cache's stats() (hits / stale_hits / misses / entries) on /metrics.
+    """
+    _caches[name] = stats
+
+
+def _render_caches() -> list:
+    lookups = ["# HELP cache_lookups_total Cache lookups by cache and result.",
+               "# TYPE cache_lookups_total counter"]
+    entries = ["# HELP cache_entries Entries currently held by each cache.",
+               "# TYPE cache_entries gauge"]
+    for name, stats in sorted(_caches.items()):
+        values = stats()
+        for field, result in (("hits", "hit"), ("stale_hits", "stale"), ("misses", "miss")):
+            if field in values:
+                lookups.append(f'cache_lookups_total{{cache="{_escape(name)}",result="{result}"}} {values[field]}')
+        entries.append(f'cache_entries{{cache="{_escape(name)}"}} {values.get("entries", 0)}')
+    return lookups + entries
+
+
+def render() -> str:
+    """
+    Every metric in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    lines.extend(_render_caches())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware feeding REQUEST_LATENCY. Labels use the matched route
+    template (e.g. /report/jobs/{job_id}), so label sets stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(time.perf_counter() - started, path, scope["method"], str(status))
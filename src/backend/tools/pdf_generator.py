@@ -1,14 +1,16 @@
 # src/backend/tools/pdf_generator.py
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from datetime import datetime
 
 def generate_economic_report(filepath, country, indicators, analysis, rag_passages):
     """
     Simple PDF generator for economic analysis reports.
     """
+    # reportlab is only loaded once a report is actually rendered
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
     doc = SimpleDocTemplate(filepath, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
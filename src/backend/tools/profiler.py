@@ -0,0 +1,397 @@
+# src/backend/tools/profiler.py
+#
+# Opt-in sampling profiler for single requests. An admin sends
+# X-Profile: 1 (or ?profile=1) together with X-Admin-Token; the request then
+# runs with a sampler thread that looks at the event loop every
+# PROFILE_SAMPLE_INTERVAL seconds and files each tick under one of:
+#   cpu    - the loop is running one of this request's tasks (stack of that code)
+#   thread - a worker thread (asyncio.to_thread / sync routes) is busy in our code
+#   await  - the loop is idle and the request's tasks are suspended; one sample
+#            per waiting task, with the await chain showing what it waits on
+#   other  - the loop is busy with another request's task
+# The result is stored as folded stacks (flamegraph.pl / speedscope input)
+# plus a JSON summary with the wall vs CPU vs awaiting split.
+#
+# Telling a task that awaits I/O from one that only awaits its own children
+# needs asyncio internals with no public equivalent (Task._fut_waiter and
+# tasks._GatheringFuture). They are probed once at import; if they are gone
+# on this Python, profiling is disabled and UNSUPPORTED says why.
+
+import asyncio
+import contextvars
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from urllib.parse import parse_qs
+from src.backend.config import PROFILING_ADMIN_TOKEN, PROFILES_DIR, PROFILES_MAX, PROFILE_SAMPLE_INTERVAL
+
+# Set while a profiled request runs; tasks created in that context are its own
+_active = contextvars.ContextVar("active_profile", default=None)
+
+# One profile at a time: samples from concurrent profiles would overlap
+_busy = threading.Lock()
+
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+def _probe_asyncio():
+    """
+    Why the sampler can't read what tasks wait on in this Python, or None.
+    Runs a parent blocked on asyncio.gather in a throwaway loop and checks
+    that the internals show exactly that.
+    """
+    gathering = getattr(asyncio.tasks, "_GatheringFuture", None)
+    if not isinstance(gathering, type):
+        return "asyncio.tasks._GatheringFuture is missing"
+
+    async def parent():
+        await asyncio.gather(asyncio.sleep(0))
+
+    async def check():
+        task = asyncio.ensure_future(parent())
+        await asyncio.sleep(0)
+        waiter = getattr(task, "_fut_waiter", AttributeError)
+        await task
+        if waiter is AttributeError:
+            return "asyncio.Task has no _fut_waiter"
+        if not isinstance(waiter, gathering):
+            return "Task._fut_waiter does not hold the future a task waits on"
+        return None
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(check())
+    except Exception as e:
+        return f"probe failed: {e.__class__.__name__}: {e}"
+    finally:
+        loop.close()
+
+
+# Only probed when profiling can be turned on at all
+UNSUPPORTED = _probe_asyncio() if PROFILING_ADMIN_TOKEN else None
+if UNSUPPORTED:
+    print(f"[profiler] disabled on Python {sys.version.split()[0]}: {UNSUPPORTED}")
+
+
+def is_admin(token: str) -> bool:
+    """
+    Constant-time check of an X-Admin-Token value; always False when
+    PROFILING_ADMIN_TOKEN is unset (profiling disabled).
+    """
+    if not PROFILING_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), PROFILING_ADMIN_TOKEN.encode("utf-8"))
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(_SRC_ROOT):
+        path = os.path.relpath(path, _SRC_ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{path}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _thread_stack(frame) -> list:
+    """
+    Labels of a thread's stack, outermost first.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _loop_stack(frame) -> list:
+    """
+    The running task's frames on the loop thread (event loop machinery dropped).
+    """
+    stack = []
+    while frame is not None and not frame.f_code.co_filename.startswith(_ASYNCIO_DIR):
+        stack.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_chain(task) -> list:
+    """
+    Labels (with line numbers) of a suspended task's coroutine chain.
+    """
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "ag_frame", None) \
+            or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(f"{_frame_label(frame.f_code)}:{frame.f_lineno}")
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "ag_await", None) \
+            or getattr(awaitable, "gi_yieldfrom", None)
+    return labels
+
+
+# Innermost frames of threads that are parked, not working: pool workers on
+# their queue, other event loops (e.g. the shared HTTP client's) in select().
+# Threads that never enter our own code (library telemetry, retry sleeps in
+# C) are ignored as well, since time.sleep and friends leave no frame.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("selectors.py", "select"),
+}
+
+
+def _is_idle(stack: list) -> bool:
+    if not stack or not any(label.startswith("src" + os.sep) for label in stack):
+        return True
+    path, function = stack[-1].split(":", 1)
+    return (os.path.basename(path), function.rsplit(".", 1)[-1]) in _IDLE_FRAMES
+
+
+class Profile:
+    def __init__(self, method: str, path: str, query: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.query = query
+        self.status = None
+        self.tasks = weakref.WeakSet()
+        self.stacks = Counter()
+        self.counts = Counter()
+        self.await_sites = Counter()
+        self._stop = threading.Event()
+
+    # ---- Sampling ----
+
+    def run(self, loop, loop_thread: int):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.loop = loop
+        self.loop_thread = loop_thread
+        self._sampler = threading.Thread(target=self._sample_forever, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def _sample_forever(self):
+        me = threading.get_ident()
+        while not self._stop.wait(PROFILE_SAMPLE_INTERVAL):
+            try:
+                self._sample(me)
+            except Exception:
+                # Stacks change under us; a torn sample is simply skipped
+                self.counts["dropped"] += 1
+
+    def _sample(self, me: int):
+        frames = sys._current_frames()
+        self.counts["ticks"] += 1
+
+        running = asyncio.current_task(self.loop)
+        if running is not None and running in self.tasks:
+            self._add("cpu", _loop_stack(frames.get(self.loop_thread)))
+        elif running is not None:
+            self.counts["other"] += 1
+        else:
+            waiting = False
+            for task in list(self.tasks):
+                if task.done():
+                    continue
+                # Parents blocked on their own child tasks add nothing
+                blocker = task._fut_waiter
+                if blocker is not None and (blocker in self.tasks or isinstance(blocker, asyncio.tasks._GatheringFuture)):
+                    continue
+                labels = _await_chain(task)
+                # Folded stacks get one sample per waiting task; the split counts the tick once
+                self.stacks[";".join(["await", *labels])] += 1
+                if labels:
+                    self.await_sites[labels[-1]] += 1
+                waiting = True
+            if waiting:
+                self.counts["await"] += 1
+
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in frames.items():
+            if ident in (me, self.loop_thread):
+                continue
+            stack = _thread_stack(frame)
+            if not _is_idle(stack):
+                self._add("thread", [names.get(ident, str(ident)), *stack])
+
+    def _add(self, kind: str, stack: list):
+        self.counts[kind] += 1
+        self.stacks[";".join([kind, *stack])] += 1
+
+    # ---- Results ----
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.wall = time.perf_counter() - self._t0
+        self.cpu = time.process_time() - self._cpu0
+
+    def summary(self) -> dict:
+        ticks = self.counts["ticks"] or 1
+        per_tick = self.wall / ticks
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "started": self.started,
+            "wall_seconds": round(self.wall, 4),
+            # Not this request's own CPU: the whole process while it ran,
+            # other requests and background threads included
+            "whole_process_cpu_seconds": round(self.cpu, 4),
+            "sample_interval_seconds": round(per_tick, 6),
+            "samples": dict(self.counts),
+            # Estimated from samples (worker threads overlap the others)
+            "split_seconds": {
+                "loop_cpu": round(self.counts["cpu"] * per_tick, 4),
+                "worker_threads": round(self.counts["thread"] * per_tick, 4),
+                "awaiting_io": round(self.counts["await"] * per_tick, 4),
+                "loop_busy_other": round(self.counts["other"] * per_tick, 4),
+            },
+            # Summed over concurrently waiting tasks, so these can exceed wall time
+            "top_await_sites": [
+                {"site": site, "task_seconds": round(n * per_tick, 4)} for site, n in self.await_sites.most_common(10)
+            ],
+        }
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(self.stacks.items()))
+
+
+# ---- Storage ----
+
+def _paths(profile_id: str):
+    return (os.path.join(PROFILES_DIR, f"{profile_id}.json"), os.path.join(PROFILES_DIR, f"{profile_id}.folded"))
+
+
+def _save(profile: Profile):
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    summary_path, folded_path = _paths(profile.id)
+    with open(folded_path, "w", encoding="utf-8") as f:
+        f.write(profile.folded())
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(profile.summary(), f, indent=2)
+
+    # Keep the newest PROFILES_MAX
+    for stale in list_profiles()[PROFILES_MAX:]:
+        for path in _paths(stale["id"]):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_profiles() -> list:
+    """
+    Stored profile summaries, newest first.
+    """
+    if not os.path.isdir(PROFILES_DIR):
+        return []
+    summaries = []
+    for name in os.listdir(PROFILES_DIR):
+        if name.endswith(".json"):
+            with open(os.path.join(PROFILES_DIR, name), "r", encoding="utf-8") as f:
+                summaries.append(json.load(f))
+    return sorted(summaries, key=lambda s: s["started"], reverse=True)
+
+
+def profile_paths(profile_id: str):
+    """
+    (summary path, folded path) of a stored profile, or None.
+    """
+    if not profile_id.isalnum():
+        return None
+    paths = _paths(profile_id)
+    return paths if os.path.exists(paths[0]) else None
+
+
+# ---- Middleware ----
+
+def _wants_profile(scope) -> bool:
+    headers = dict(scope["headers"])
+    flag = headers.get(b"x-profile", b"").decode("latin-1")
+    if not flag:
+        flag = (parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile") or [""])[0]
+    if flag.lower() not in ("1", "true", "yes"):
+        return False
+    return is_admin(headers.get(b"x-admin-token", b"").decode("latin-1"))
+
+
+def _tracking_factory(previous):
+    """
+    Task factory: tasks created inside a profiled request belong to it.
+    """
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        profile = _active.get()
+        if profile is not None:
+            profile.tasks.add(task)
+        return task
+    return factory
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that ask for it (admins only). The response carries
+    X-Profile-Id; fetch the result from /admin/profiles/{id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if UNSUPPORTED:
+            await self.app(scope, receive, self._with_header(send, b"x-profile", b"unsupported"))
+            return
+
+        if not _busy.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, b"x-profile", b"busy"))
+            return
+
+        loop = asyncio.get_running_loop()
+        profile = Profile(scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"))
+        profile.tasks.add(asyncio.current_task())
+        previous_factory = loop.get_task_factory()
+        loop.set_task_factory(_tracking_factory(previous_factory))
+        token = _active.set(profile)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+            await send(message)
+
+        profile.run(loop, threading.get_ident())
+        try:
+            await self.app(scope, receive, self._with_header(send_with_status, b"x-profile-id", profile.id.encode()))
+        finally:
+            profile.stop()
+            _active.reset(token)
+            loop.set_task_factory(previous_factory)
+            _busy.release()
+            await asyncio.to_thread(_save, profile)
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (name, value)]}
+            await send(message)
+        return wrapped
@@ -0,0 +1,195 @@
+# src/backend/tools/query_parser.py
+#
+# Country and indicator extraction in one pass over the text. Every known
+# phrase (ISO names from pycountry, COUNTRY_MAP aliases, INDICATOR_MAP
+# keywords) is compiled into a single trie-shaped regex, so a scan costs the
+# same however large the tables grow, and the longest phrase wins at each
+# position ("south africa" over "south", "gdp per capita" over "gdp").
+# Matches must stand alone: "us" in "thus" or "focus" is no match. Region
+# names (NOT_COUNTRIES) are matched only to keep "Latin America" from
+# reading as "america".
+#
+# Country codes ("US", "DEU") count only when written in upper case, and
+# codes that double as English words ("IN", "IT", "CAN") not even then.
+# Full World Bank indicator codes ("SL.UEM.TOTL.ZS") are matched directly.
+
+import re
+import threading
+import unicodedata
+from src.backend.tools.country_map import COUNTRY_MAP, NOT_COUNTRIES
+from src.backend.tools.indicator_map import INDICATOR_MAP
+
+# ISO codes that are also everyday (upper-case) words or abbreviations
+_AMBIGUOUS_CODES = {
+    "AD", "AI", "AM", "AS", "AT", "BE", "BY", "CV", "DO", "FM", "ID", "IN", "IS", "IT",
+    "ME", "MY", "NO", "PM", "PS", "TO", "TV",
+    "AND", "ARE", "BEN", "BRA", "CAN", "COD", "COM", "DOM", "FIN", "GAB", "GIN", "GUM",
+    "LIE", "MAC", "MAR", "MUS", "NOR", "PAN", "PER", "SUR", "TON", "VAT",
+}
+
+# World Bank indicator code, e.g. NY.GDP.MKTP.KD.ZG
+_INDICATOR_CODE = r"[A-Z]{2}(?:\.[A-Z0-9]{2,8}){2,6}"
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def _fold(text: str) -> str:
+    """
+    Strip accents ("Côte d'Ivoire" → "Cote d'Ivoire") and collapse whitespace.
+    Case is kept: codes are matched case-sensitively.
+    """
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def _trie_regex(words) -> str:
+    """
+    One regex matching any of `words`, shaped as a trie: shared prefixes are
+    written once and longer continuations are tried before stopping early.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+def _country_tables():
+    """
+    (phrase → code, upper-case code → code) from pycountry plus COUNTRY_MAP.
+    """
+    import pycountry
+
+    names = {}
+    codes = {}
+    # Short forms of "Iran, Islamic Republic of" style names; skipped when two
+    # countries share one ("Korea", "Virgin Islands") or it is another
+    # country's name ("Congo")
+    short_forms = {}
+
+    for country in pycountry.countries:
+        codes[country.alpha_2] = country.alpha_2
+        codes[country.alpha_3] = country.alpha_2
+        for attr in ("name", "official_name", "common_name"):
+            name = getattr(country, attr, None)
+            if not name:
+                continue
+            name = _fold(name).lower()
+            if name.startswith("the "):
+                name = name[4:]
+            names[name] = country.alpha_2
+            # "Falkland Islands (Malvinas)" → "Falkland Islands"
+            if "(" in name:
+                names[name.split("(", 1)[0].strip()] = country.alpha_2
+            if ", " in name:
+                short_forms.setdefault(name.split(", ", 1)[0], set()).add(country.alpha_2)
+
+    for short, found in short_forms.items():
+        if len(found) == 1 and short not in names:
+            names[short] = next(iter(found))
+
+    for alias, code in COUNTRY_MAP.items():
+        if len(alias) <= 3:
+            codes[alias.upper()] = code
+        else:
+            names[alias] = code
+
+    for code in _AMBIGUOUS_CODES:
+        codes.pop(code, None)
+
+    return names, codes
+
+
+def _build():
+    names, codes = _country_tables()
+
+    # Phrase → ("country" | "indicator" | None, code); indicator keywords win a
+    # tie, and regions only shadow the country names inside them
+    phrases = {name: ("country", code) for name, code in names.items()}
+    phrases.update({keyword: ("indicator", code) for keyword, code in INDICATOR_MAP.items()})
+    phrases.update({region: (None, None) for region in NOT_COUNTRIES})
+
+    pattern = re.compile(
+        r"(?<![\w.])(?:"
+        rf"(?P<indicator_code>{_INDICATOR_CODE})"
+        rf"|(?i:(?P<phrase>{_trie_regex(phrases)}))"
+        rf"|(?P<country_code>{_trie_regex(codes)})"
+        r")(?![\w])"
+    )
+    return pattern, phrases, codes
+
+
+def _get_matcher():
+    """
+    (pattern, phrase table, code table), compiled once per process on first use.
+    """
+    global _matcher
+
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = _build()
+
+    return _matcher
+
+
+def warm_up():
+    """
+    Compile the pattern ahead of the first query.
+    """
+    _get_matcher()
+
+
+def iter_matches(text: str):
+    """
+    ("country" | "indicator", code) for every mention in the text, in order.
+    """
+    pattern, phrases, codes = _get_matcher()
+
+    for match in pattern.finditer(_fold(text)):
+        kind = match.lastgroup
+        if kind == "indicator_code":
+            yield "indicator", match.group(kind)
+        elif kind == "phrase":
+            found = phrases[match.group(kind).lower()]
+            if found[0] is not None:
+                yield found
+        else:
+            yield "country", codes[match.group(kind)]
+
+
+def parse_query(text: str) -> dict:
+    """
+    Countries and indicators mentioned in the text, each in order of first
+    mention without repeats.
+
+    Example:
+        "Compare German and French inflation" →
+        {"countries": ["DE", "FR"], "indicators": ["FP.CPI.TOTL.ZG"]}
+    """
+    found = {"country": {}, "indicator": {}}
+    for kind, code in iter_matches(text):
+        found[kind].setdefault(code, None)
+
+    return {"countries": list(found["country"]), "indicators": list(found["indicator"])}
+
+
+def find_countries(text: str) -> list:
+    return parse_query(text)["countries"]
+
+
+def find_indicators(text: str) -> list:
+    return parse_query(text)["indicators"]
@@ -0,0 +1,109 @@
+# src/backend/tools/series.py
+#
+# Indicator series held as two NumPy arrays, dates and float64 values (NaN
+# where missing), newest first. Annual series keep their dates as int16
+# years; monthly and quarterly ones ("2020M01", "2020Q3") keep the World Bank
+# labels as strings, so periods within a year stay distinct. Filtering,
+# slicing and the latest-value lookup are array operations; JSON is produced
+# only at the edge, either columnar ({"dates": [...], "values": [...]}) or as
+# the older list of {"date", "value"} records.
+
+import numpy as np
+
+SERIES_FORMATS = ("columns", "records")
+
+
+class IndicatorSeries:
+    __slots__ = ("dates", "values")
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray):
+        self.dates = dates
+        self.values = values
+
+    # ---- Construction ----
+
+    @classmethod
+    def from_records(cls, records: list) -> "IndicatorSeries":
+        """
+        From World Bank records (or cached {"date", "value"} rows) in any
+        order.
+        """
+        # None becomes NaN
+        values = np.array([r["value"] for r in records], dtype=np.float64)
+        return cls._sorted(_dates([str(r["date"]) for r in records]), values)
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "IndicatorSeries":
+        return cls(_dates(columns["dates"]), np.array(columns["values"], dtype=np.float64))
+
+    @classmethod
+    def _sorted(cls, dates: np.ndarray, values: np.ndarray) -> "IndicatorSeries":
+        # Labels of one frequency sort like their periods ("2020M02" > "2020M01")
+        order = np.argsort(dates, kind="stable")[::-1]
+        return cls(dates[order], values[order])
+
+    @classmethod
+    def load(cls, cached) -> "IndicatorSeries":
+        """
+        From what the series cache holds: columns, or records written before
+        the columnar format.
+        """
+        return cls.from_columns(cached) if isinstance(cached, dict) else cls.from_records(cached)
+
+    # ---- Selection ----
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index) -> "IndicatorSeries":
+        """
+        Slice (series[:5] = the five latest periods) or boolean mask.
+        """
+        return IndicatorSeries(self.dates[index], self.values[index])
+
+    def dropna(self) -> "IndicatorSeries":
+        return self[~np.isnan(self.values)]
+
+    def latest(self):
+        """
+        (date, value) of the most recent non-missing value, or None. The date
+        is an int year, or the period label for sub-annual series.
+        """
+        present = np.flatnonzero(~np.isnan(self.values))
+        if not len(present):
+            return None
+        i = present[0]
+        return self.dates[i].item(), float(self.values[i])
+
+    # ---- Output ----
+
+    def _value_list(self) -> list:
+        # NaN is not valid JSON: missing periods go out as null
+        return [None if v != v else v for v in self.values.tolist()]
+
+    def to_columns(self) -> dict:
+        return {"dates": self.dates.tolist(), "values": self._value_list()}
+
+    def to_records(self) -> list:
+        return [
+            {"date": str(date), "value": value}
+            for date, value in zip(self.dates.tolist(), self._value_list())
+        ]
+
+    def to_json(self, format: str = "columns"):
+        """
+        The series in one of SERIES_FORMATS.
+        """
+        return self.to_records() if format == "records" else self.to_columns()
+
+
+def _dates(labels) -> np.ndarray:
+    """
+    int16 years when every label is a plain year, else the labels as strings.
+    """
+    dates = np.asarray(labels)
+    if dates.dtype.kind in "iuf":
+        return dates.astype(np.int16)
+    if all(len(d) == 4 and d.isdigit() for d in dates.tolist()):
+        return dates.astype(np.int16)
+    return dates.astype(str)
@@ -0,0 +1,30 @@
+# src/backend/tools/sse.py
+
+import json
+from fastapi.responses import StreamingResponse
+
+
+def format_event(event: str, data) -> str:
+    """
+    Encode one Server-Sent Event with a JSON payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Wrap an async iterator of (event, data) pairs into a text/event-stream
+    response. Errors raised mid-stream are sent as a final "error" event.
+    """
+    async def _encode():
+        try:
+            async for event, data in events:
+                yield format_event(event, data)
+        except Exception as e:
+            yield format_event("error", {"error": str(e)})
+
+    return StreamingResponse(
+        _encode(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
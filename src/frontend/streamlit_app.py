@@ -1,6 +1,8 @@
 # src/frontend/streamlit_app.py
 
 import io
+import json
+import time
 import requests
 import streamlit as st
 import pandas as pd
@@ -10,6 +12,25 @@ import pycountry
 
 BACKEND_URL = "http://localhost:8000"
 
+
+def iter_sse(response):
+    """
+    Yield (event, data) pairs from a text/event-stream response.
+    """
+    event, data = None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if event is not None:
+                yield event, json.loads("\n".join(data))
+            event, data = None, []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
+
 # Optional TTS
 try:
     from gtts import gTTS
@@ -196,16 +217,18 @@ if section == "🏠 Live Dashboard":
             timeout=30
         ).json()
 
-        df = pd.DataFrame(resp["values"])
-        df["value"] = pd.to_numeric(df["value"], errors="coerce")
-        df["date"] = df["date"].astype(int)
-        df = df.dropna().sort_values("date")
+        # Columnar, latest year first, missing years already dropped
+        dates = resp["dates"][::-1]
+        values = resp["values"][::-1]
+
+        if resp.get("latest"):
+            st.metric(f"Latest ({resp['latest']['date']})", f"{resp['latest']['value']:,.2f}")
 
         # ------- Main Neon Line Chart -------
         fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=df["date"],
-            y=df["value"],
+            x=dates,
+            y=values,
             mode="lines+markers",
             line=dict(color="#00E5FF", width=3),
             marker=dict(color="#00E5FF", size=6),
@@ -222,8 +245,8 @@ if section == "🏠 Live Dashboard":
         # ------- Sparkline -------
         spark = go.Figure()
         spark.add_trace(go.Scatter(
-            x=df["date"],
-            y=df["value"],
+            x=dates,
+            y=values,
             mode="lines",
             line=dict(color="#38BDF8", width=2),
             hoverinfo="skip"
@@ -247,20 +270,18 @@ if section == "🏠 Live Dashboard":
     sample_countries = ["US", "DE", "FR", "GB", "NL", "JP", "CN", "IN", "BR", "ZA", "AU", "CA"]
     rows = []
 
-    for c in sample_countries:
-        try:
-            r = requests.get(
-                f"{BACKEND_URL}/macro/live_chart",
-                params={"country": c, "indicator": selected_indicator},
-                timeout=10
-            ).json()
-
-            vals = r.get("values", [])
-            if vals:
-                alpha3 = pycountry.countries.get(alpha_2=c).alpha_3
-                rows.append({"iso3": alpha3, "country": c, "value": float(vals[0]["value"])})
-        except:
-            continue
+    # One backend call (and one World Bank call) for every country
+    try:
+        r = requests.get(
+            f"{BACKEND_URL}/macro/batch",
+            params={"countries": ",".join(sample_countries), "indicator": selected_indicator},
+            timeout=15
+        ).json()
+        for v in r.get("values", []):
+            alpha3 = v.get("iso3") or pycountry.countries.get(alpha_2=v["country"]).alpha_3
+            rows.append({"iso3": alpha3, "country": v["country"], "value": float(v["value"])})
+    except:
+        pass
 
     if rows:
         df_map = pd.DataFrame(rows)
@@ -295,29 +316,54 @@ if section == "💬 Ask the Agent":
             st.warning("Please enter a question.")
             st.stop()
 
-        with st.spinner("Consulting global databases…"):
-            result = requests.get(
-                f"{BACKEND_URL}/ask-economic",
-                params={"query": query},
-                timeout=60
-            ).json()
-
         # ------------ Context Cards ------------
         st.markdown('<div class="section">📌 Context Snapshot</div>', unsafe_allow_html=True)
 
         c1, c2, c3 = st.columns(3)
-
-        with c1:
-            st.markdown(f"<div class='glass-card'><b>Country</b><br>{result['country']}</div>", unsafe_allow_html=True)
-        with c2:
-            st.markdown(f"<div class='glass-card'><b>Indicators</b><br>{', '.join(result['indicators_used'])}</div>", unsafe_allow_html=True)
-        with c3:
-            rag_count = len([p for p in result["rag_passages"].split("- ") if p.strip()])
-            st.markdown(f"<div class='glass-card'><b>RAG Matches</b><br>{rag_count}</div>", unsafe_allow_html=True)
+        card_country, card_indicators, card_rag = c1.empty(), c2.empty(), c3.empty()
+        progress = st.empty()
 
         # ------------ Analysis ------------
         st.markdown('<div class="section">🧠 Final Assessment</div>', unsafe_allow_html=True)
-        st.markdown(f"<div class='glass-card'>{result['analysis']}</div>", unsafe_allow_html=True)
+        analysis_box = st.empty()
+
+        # Stream pipeline progress, then the analysis token by token
+        result = None
+        analysis = ""
+        progress.caption("Consulting global databases…")
+
+        with requests.get(
+            f"{BACKEND_URL}/ask-economic/stream",
+            params={"query": query},
+            stream=True,
+            timeout=60
+        ) as resp:
+            for event, data in iter_sse(resp):
+                if event == "country":
+                    card_country.markdown(f"<div class='glass-card'><b>Country</b><br>{data['country']}</div>", unsafe_allow_html=True)
+                elif event == "indicators":
+                    card_indicators.markdown(f"<div class='glass-card'><b>Indicators</b><br>{', '.join(data['indicators'])}</div>", unsafe_allow_html=True)
+                elif event == "indicator":
+                    progress.caption(f"Fetched {data['indicator']}…")
+                elif event == "rag":
+                    rag_count = len([p for p in data["passages"].split("- ") if p.strip()])
+                    card_rag.markdown(f"<div class='glass-card'><b>RAG Matches</b><br>{rag_count}</div>", unsafe_allow_html=True)
+                elif event == "token":
+                    analysis += data["text"]
+                    analysis_box.markdown(f"<div class='glass-card'>{analysis}▌</div>", unsafe_allow_html=True)
+                elif event == "done":
+                    result = data
+                elif event == "error":
+                    st.error(f"Analysis failed: {data['error']}")
+                    st.stop()
+
+        progress.empty()
+
+        if result is None:
+            st.error("The analysis stream ended unexpectedly. Check backend logs.")
+            st.stop()
+
+        analysis_box.markdown(f"<div class='glass-card'>{result['analysis']}</div>", unsafe_allow_html=True)
 
         # ------------ TTS ------------
         if TTS_AVAILABLE:
@@ -394,19 +440,33 @@ if section == "📄 Reports":
             st.warning("Please enter a question.")
             st.stop()
 
-        with st.spinner("Compiling PDF report…"):
-            pdf_response = requests.get(
-                f"{BACKEND_URL}/report/generate",
-                params={"query": query},
-                timeout=90
-            )
+        job = requests.post(
+            f"{BACKEND_URL}/report/jobs",
+            params={"query": query},
+            timeout=15
+        ).json()
 
-        if pdf_response.status_code == 200:
+        # Poll the job queue until the PDF is rendered
+        status = st.empty()
+        with st.spinner("Compiling PDF report…"):
+            while job.get("status") in ("queued", "running"):
+                status.caption(f"Report job {job['status']}…")
+                time.sleep(1)
+                job = requests.get(f"{BACKEND_URL}/report/jobs/{job['id']}", timeout=10).json()
+        status.empty()
+
+        pdf_response = None
+        if job.get("status") == "done":
+            pdf_response = requests.get(f"{BACKEND_URL}/report/jobs/{job['id']}/download", timeout=30)
+
+        if pdf_response is not None and pdf_response.headers.get("content-type") == "application/pdf":
+            if job.get("cached"):
+                st.caption("Served from a previously generated report (data unchanged).")
             st.download_button(
                 "⬇️ Download PDF Report",
                 data=pdf_response.content,
-                file_name="Economic_Report.pdf",
+                file_name=f"Economic_Report_{job['country']}.pdf",
                 mime="application/pdf"
             )
         else:
-            st.error("Unable to generate report. Check backend logs.")
+            st.error(f"Unable to generate report: {job.get('error') or 'check backend logs.'}")